@@ -6,40 +6,109 @@ from email.mime import message
 import sys
 import os
 import socket
+import selectors
 import threading
 import struct
 import io
 import json
 import time
+import secrets
+import subprocess
 import mss
 import numpy as np
 import cv2
 from PIL import ImageGrab, Image
 from datetime import datetime
-from queue import Queue, Empty
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QListWidget, QListWidgetItem, QFileDialog,
+    QPushButton, QLabel, QListWidget, QFileDialog,
     QMessageBox, QTextEdit, QSizePolicy, QSplitter, QInputDialog,
     QGroupBox, QCheckBox, QSpinBox, QTabWidget, QTableWidget,
     QTableWidgetItem, QHeaderView, QProgressBar
 )
-from PyQt5.QtCore import Qt, QTimer, QByteArray
-from PyQt5.QtGui import QPixmap, QImage, QFont, QColor
+from PyQt5.QtCore import Qt, QTimer, QObject, pyqtSignal, QThreadPool, QRunnable
+from PyQt5.QtGui import QPixmap, QImage, QFont, QColor, QTextCursor
 
 # ============ Configuration ============
 LISTEN_HOST = "0.0.0.0"
 LISTEN_PORT = 5001
 RECV_BUFFER = 65536
 MAX_IMAGE_SIZE = 200 * 1024 * 1024  # 200 MB
+MAX_FRAME_CHUNK = 1024 * 1024  # Ring is 2x this; bigger frames get their own buffer
+SOCKET_BUFFER = 1024 * 1024  # SO_SNDBUF / SO_RCVBUF for client sockets
+FILE_WRITE_BACKLOG = 16 * 1024 * 1024  # pause reading a client when this much upload is unwritten
+FILE_WRITE_BUFFER = 1024 * 1024  # buffered writer size for uploads
+LOG_RING_SIZE = 10_000  # undrained log lines kept; the oldest are dropped first
+LOG_DRAIN_BATCH = 256  # log lines moved into the log view per timer tick
+LOG_VIEW_MAX_LINES = 5000  # older lines are dropped from the log view
 INBOX_DIR = os.path.join(os.path.expanduser("~"), "lab_inbox_admin")
 os.makedirs(INBOX_DIR, exist_ok=True)
 
 # ============ Helper Functions ============
 def now_ts():
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return format_ts(time.time())
+
+_ts_cache = [None, ""]  # (second, formatted) of the last format_ts() call
+
+def format_ts(ts):
+    """Format a time.time() value like now_ts(); each second is formatted once"""
+    sec = int(ts)
+    if _ts_cache[0] != sec:
+        _ts_cache[0], _ts_cache[1] = sec, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+    return _ts_cache[1]
+
+def tune_socket(sock):
+    """Low-latency, large-buffer settings for a client connection"""
+    for level, opt, value in (
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER),
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ):
+        try:
+            sock.setsockopt(level, opt, value)
+        except OSError:
+            pass
+
+def open_preallocated(path, size):
+    """Open `path` for a sequential write of `size` bytes, reserving the space up front"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        if size:
+            try:
+                if hasattr(os, "posix_fallocate"):
+                    os.posix_fallocate(fd, 0, size)
+                else:
+                    os.ftruncate(fd, size)  # Windows: setting EOF allocates the clusters
+            except OSError:
+                pass  # e.g. filesystem without fallocate support
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        return os.fdopen(fd, "wb", buffering=FILE_WRITE_BUFFER)
+    except BaseException:
+        os.close(fd)
+        raise
+
+def write_vectored(f, parts):
+    """Write a tuple of buffers with one writev() where the platform has it"""
+    if not hasattr(os, "writev"):  # Windows
+        for part in parts:
+            f.write(part)
+        return
+    fd = f.fileno()
+    total = sum(len(p) for p in parts)
+    n = os.writev(fd, parts)
+    if n < total:
+        # Short write: finish the remainder the plain way
+        rest = b"".join(parts)[n:]
+        while rest:
+            rest = rest[os.write(fd, rest):]
 
 def format_bytes(bytes_size):
     """Format bytes to human readable"""
@@ -49,33 +118,194 @@ def format_bytes(bytes_size):
         bytes_size /= 1024.0
     return f"{bytes_size:.2f} TB"
 
+def open_native(path):
+    """Open a file or folder with the OS default handler, without a shell"""
+    if sys.platform.startswith("win"):
+        os.startfile(path)
+    elif sys.platform.startswith("darwin"):
+        subprocess.Popen(["open", path])
+    else:
+        subprocess.Popen(["xdg-open", path])
+
 # Constants (you can adjust)
 SCREENSHOT_QUALITY = 60      # JPEG quality
 SCREEN_SHARE_INTERVAL = 0.03  # seconds per frame (≈ 30 FPS)
+BULK_IDLE_TIMEOUT = 30        # seconds a bulk channel may stall mid-upload
+
+# os.sendfile is missing on Windows; file sends fall back to read()+send() there
+_HAS_SENDFILE = hasattr(os, "sendfile")
+
+# Precompiled wire-format size fields
+_U64_BE = struct.Struct(">Q")  # frame / file body length
+_U32_BE = struct.Struct(">I")  # SEND_FILE metadata length
 
 # ============ Client Handler ============
+# Receive states of the per-connection protocol state machine
+STATE_HEADER = 0
+STATE_FRAME_SIZE = 1
+STATE_FRAME_BODY = 2
+STATE_FILE_META = 3
+STATE_FILE_SIZE = 4
+STATE_FILE_BODY = 5
+STATE_FRAME_DIRECT = 6  # large frame received straight into its own buffer
+
+
+class _OutFile:
+    """Queued outbound file, sent as the socket becomes writable"""
+
+    def __init__(self, f, size, on_done=None):
+        self.f = f
+        self.offset = 0
+        self.remaining = size
+        self.pending = b""  # read()+send() fallback only
+        self.use_sendfile = _HAS_SENDFILE
+        self.on_done = on_done
+
+    def close(self):
+        try:
+            self.f.close()
+        except:
+            pass
+
+
+class _FileSink:
+    """Inbound file written behind the I/O thread, in order, on the server's disk pool
+
+    Chunks and the final callback are queued and drained by at most one pool
+    task at a time, so writes for one file never reorder. A chunk may also be
+    a tuple of buffers, written with write_vectored() (needs an unbuffered file).
+    """
+
+    def __init__(self, pool, f, on_resume=None):
+        self.pool = pool
+        self.f = f
+        self.on_resume = on_resume  # called from the pool once the backlog drains
+        self.lock = threading.Lock()
+        self.pending = deque()  # bytes chunks, then one callable
+        self.pending_bytes = 0
+        self.busy = False
+        self.throttled = False
+        self.error = None
+
+    @staticmethod
+    def _size(item):
+        return sum(len(p) for p in item) if isinstance(item, tuple) else len(item)
+
+    def write(self, data):
+        """Queue a chunk; True means the caller should stop reading for now"""
+        with self.lock:
+            self.pending.append(data)
+            self.pending_bytes += self._size(data)
+            if self.pending_bytes > FILE_WRITE_BACKLOG:
+                self.throttled = True
+            self._kick()
+            return self.throttled
+
+    def finish(self, on_done):
+        """Close the file once everything is written, then call on_done(error)"""
+        with self.lock:
+            self.pending.append(on_done)
+            self._kick()
+
+    def abort(self, on_done):
+        """Drop unwritten chunks, then close and call on_done(error)"""
+        with self.lock:
+            self.pending.clear()
+            self.pending_bytes = 0
+            self.pending.append(on_done)
+            self._kick()
+
+    def _kick(self):
+        if not self.busy:
+            self.busy = True
+            self.pool.submit(self._drain)
+
+    def _drain(self):
+        while True:
+            resume = False
+            with self.lock:
+                if not self.pending:
+                    self.busy = False
+                    return
+                item = self.pending.popleft()
+                if not callable(item):
+                    self.pending_bytes -= self._size(item)
+                    if self.throttled and self.pending_bytes <= FILE_WRITE_BACKLOG // 2:
+                        self.throttled = False
+                        resume = True
+
+            if callable(item):
+                try:
+                    self.f.close()
+                except Exception as e:
+                    self.error = self.error or e
+                item(self.error)
+            elif self.error is None:
+                try:
+                    if isinstance(item, tuple):
+                        write_vectored(self.f, item)
+                    else:
+                        self.f.write(item)
+                except Exception as e:
+                    self.error = e
+
+            if resume and self.on_resume:
+                self.on_resume()
+
+
 class ClientHandler:
-    """Enhanced client handler with screen share support"""
+    """Per-connection protocol state machine driven by the server's I/O loop"""
 
     def __init__(self, sock: socket.socket, addr, server):
         self.sock = sock
         self.addr = addr
         self.server = server
-        self.key = f"{addr[0]}:{addr[1]}"
-        self.thread = threading.Thread(target=self._reader_loop, daemon=True)
+        self.key = sys.intern(f"{addr[0]}:{addr[1]}")
+        self.safe_key = self.key.replace(":", "_")  # filename-friendly form
+        # Bulk channel: the client opens a second connection with BULK:<client_id>
+        # so file pushes don't hold up commands and frames on this one
+        self.client_id = secrets.token_hex(16)
+        self.bulk = None  # ClientHandler carrying this client's file transfers
+        self.control = None  # set on a bulk handler: the client it belongs to
+        self.pending = True  # until the first line says client or bulk channel
         self.running = threading.Event()
         self.running.set()
-        self.lock = threading.Lock()
+        self.lock = threading.Lock()  # guards the outbound queue
+
+        # Receive ring buffer: unread bytes live in _rb[_head:_tail]
+        self._rb = bytearray(2 * MAX_FRAME_CHUNK)
+        self._mv = memoryview(self._rb)
+        self._head = 0
+        self._tail = 0
+        self._frame_buf = None  # pre-sized buffer for a frame > MAX_FRAME_CHUNK
+        self._frame_mv = None
+        self._frame_off = 0
+
+        # Receive state
+        self._state = STATE_HEADER
+        self._expect = 0  # bytes still owed by the current frame/file body
+        self._file_meta = None
+        self._file = None  # (outf, tmp_path, outpath, fname) while a file is being written
+
+        # Outbound queue of bytearrays and _OutFile entries, flushed by the I/O loop
+        self._outq = deque()
+        self._out_off = 0
+        self._writing = False
+        self._reading = True
+        self._events = selectors.EVENT_READ  # as registered by AdminServer._accept
 
         # Statistics
         self.last_image = None
         self.last_image_ts = None
+        self._save_next_frame = False  # one-shot: persist the next frame (snapshot)
+        self._stream_sink = None  # <safe_key>.mjpg recording, when stream saving is on
         self.connected_time = time.time()
         self.frames_received = 0
         self.bytes_received = 0
         self.files_received = 0
         self.is_streaming = False
         self.last_heartbeat = time.time()
+        self.last_recv = time.time()
         self.client_info = {
             "hostname": addr[0],
             "status": "connected"
@@ -104,6 +334,11 @@ class ClientHandler:
                 monitor = sct.monitors[1]  # Primary display
                 while self.sharing_active and self.connected:
                     try:
+                        # Drop this frame while the previous one is still queued
+                        if self._outq:
+                            time.sleep(SCREEN_SHARE_INTERVAL)
+                            continue
+
                         frame = np.array(sct.grab(monitor))
                         frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
 
@@ -114,8 +349,9 @@ class ClientHandler:
 
                         data = encoded.tobytes()
                         header = b"FRAME\n"
-                        size = struct.pack(">Q", len(data))
-                        self.client_socket.sendall(header + size + data)
+                        size = _U64_BE.pack(len(data))
+                        if not self.queue_send(header + size + data):
+                            break
 
                         # Optional: track stats
                         self.frames_received = getattr(self, "frames_received", 0) + 1
@@ -143,11 +379,19 @@ class ClientHandler:
         else:
             print("[ℹ️] Screen sharing is not active")
 
-    def start(self):
-        self.thread.start()
-
     def stop(self):
+        """Close the connection from any thread"""
         self.running.clear()
+        self.server.call_soon(self.close)
+
+    def close(self):
+        """Unregister from the I/O loop and close the socket (I/O thread)"""
+        if not self.connected:
+            return
+        self.connected = False
+        self.running.clear()
+        self.server.unregister(self.sock)
+        self.server._pending.discard(self)
         try:
             self.sock.shutdown(socket.SHUT_RDWR)
         except:
@@ -156,18 +400,69 @@ class ClientHandler:
             self.sock.close()
         except:
             pass
+        self._abort_file()
+        self._frame_buf = self._frame_mv = None
+        if self._stream_sink is not None:
+            self._stream_sink.finish(lambda error: None)
+            self._stream_sink = None
+        if self.control is not None and self.control.bulk is self:
+            self.control.bulk = None
+        if self.bulk is not None:
+            self.bulk.close()
+        with self.lock:
+            for item in self._outq:
+                if isinstance(item, _OutFile):
+                    item.close()
+            self._outq.clear()
+
+    def _disconnect(self):
+        """Tear down after EOF, error or timeout (I/O thread)"""
+        if not self.connected:
+            return
+        self.close()
+        self.client_info["status"] = "disconnected"
+        self.server.log(f"❌ {self.key} disconnected")
+        self.server.remove_client(self.key)
+
+    # ---- Sending ----
+
+    def _enqueue(self, *items, flush=True):
+        """Queue bytes and/or _OutFile entries atomically, then ask the loop to flush
+
+        With flush=False the caller is responsible for server.request_flush().
+        """
+        if not self.connected:
+            return False
+        with self.lock:
+            for item in items:
+                if isinstance(item, _OutFile):
+                    self._outq.append(item)
+                elif self._outq and isinstance(self._outq[-1], bytearray):
+                    # Coalesce small writes so they leave in one send()
+                    self._outq[-1] += item
+                else:
+                    self._outq.append(bytearray(item))
+        if flush:
+            self.server.request_flush(self)
+        return True
+
+    def queue_send(self, data: bytes):
+        """Queue raw bytes for the client, False once disconnected"""
+        return self._enqueue(data)
 
     def send_command(self, cmd_str: str):
         """Send command to client"""
-        try:
-            data = (cmd_str + "\n").encode("utf-8")
-            with self.lock:
-                self.sock.sendall(data)
+        data = (cmd_str + "\n").encode("utf-8")
+        if self.queue_send(data):
             self.server.log(f"✉️ Sent to {self.key}: {cmd_str}")
             return True
-        except Exception as e:
-            self.server.log(f"❌ Send error to {self.key}: {e}")
-            return False
+        self.server.log(f"❌ Send error to {self.key}: not connected")
+        return False
+
+    def request_screenshot(self):
+        """Ask the client for one screen and save the frame it sends back"""
+        self._save_next_frame = True
+        return self.send_command("REQUEST_SCREEN")
 
     def send_file(self, filepath: str, destination: str = None):
         """Send file to client with optional destination path"""
@@ -189,331 +484,393 @@ class ClientHandler:
             metadata = {
                 "filename": basename,
                 "destination": destination,
-                "timestamp": int(time.time())
+                "timestamp": int(time.time()),
+                "size": filesize
             }
             meta_json = json.dumps(metadata).encode('utf-8')
             
-            # Protocol: "SEND_FILE\n" + metadata_length(4 bytes) + metadata + file_data
+            # Protocol: "SEND_FILE\n" + metadata_length(4 bytes) + metadata + file_data + "<END>"
+            # Clients read exactly metadata["size"] bytes; "<END>" is kept for older ones
             header = b"SEND_FILE\n"
-            meta_len = struct.pack(">I", len(meta_json))
+            meta_len = _U32_BE.pack(len(meta_json))
             
-            with self.lock:
-                self.sock.sendall(header)
-                self.sock.sendall(meta_len)
-                self.sock.sendall(meta_json)
-                time.sleep(0.05)
-                
-                sent = 0
-                with open(filepath, "rb") as f:
-                    while True:
-                        chunk = f.read(RECV_BUFFER)
-                        if not chunk:
-                            break
-                        self.sock.sendall(chunk)
-                        sent += len(chunk)
-                
-                self.sock.sendall(b"<END>")
+            f = open(filepath, "rb")
+            done = lambda: self.server.log(f"✅ File sent successfully: {basename}")
+            
+            # Prefer the bulk channel; older clients only have this connection
+            channel = self.bulk if self.bulk is not None and self.bulk.connected else self
             
-            self.server.log(f"✅ File sent successfully: {basename}")
+            # Queued as one unit so no command can land inside the file data
+            if not channel._enqueue(header + meta_len + meta_json, _OutFile(f, filesize, done), b"<END>"):
+                f.close()
+                self.server.log(f"❌ File send error: {self.key} is not connected")
+                return False
             return True
             
         except Exception as e:
             self.server.log(f"❌ File send error: {e}")
             return False
 
-    def _reader_loop(self):
-        """Read data from client"""
-        sock = self.sock
-        sock.settimeout(30.0)
+    def _set_writing(self, enabled):
+        """Toggle EVENT_WRITE interest for this socket (I/O thread)"""
+        self._writing = enabled
+        self._update_events()
+
+    def _set_reading(self, enabled):
+        """Toggle EVENT_READ interest, used for upload backpressure (I/O thread)"""
+        if self.connected:
+            self._reading = enabled
+            self._update_events()
+
+    def _update_events(self):
+        events = ((selectors.EVENT_READ if self._reading else 0)
+                  | (selectors.EVENT_WRITE if self._writing else 0))
+        if events == self._events:
+            return
+        selector = self.server.selector
+        if not events:
+            selector.unregister(self.sock)
+        elif not self._events:
+            selector.register(self.sock, events, self)
+        else:
+            selector.modify(self.sock, events, self)
+        self._events = events
 
+    def on_writable(self):
+        """Send as much queued output as the socket accepts (I/O thread)"""
+        finished = []
         try:
-            buffer = b""
-            while self.running.is_set():
+            with self.lock:
+                while self._outq:
+                    item = self._outq[0]
+                    if isinstance(item, _OutFile):
+                        if not self._pump_file(item):
+                            break  # kernel buffer full
+                        self._outq.popleft()
+                        item.close()
+                        finished.append(item)
+                        continue
+
+                    self._out_off += self.sock.send(memoryview(item)[self._out_off:])
+                    if self._out_off < len(item):
+                        break  # kernel buffer full
+                    self._out_off = 0
+                    self._outq.popleft()
+                pending = bool(self._outq)
+            self._set_writing(pending)
+        except (BlockingIOError, InterruptedError):
+            self._set_writing(True)
+        except Exception as e:
+            self.server.log(f"❌ Send error to {self.key}: {e}")
+            self._disconnect()
+        for item in finished:
+            if item.on_done:
+                item.on_done()
+
+    def _pump_file(self, item):
+        """Push a queued file into the socket, True once all of it is sent"""
+        while item.remaining > 0 or item.pending:
+            if item.use_sendfile:
                 try:
-                    data = sock.recv(RECV_BUFFER)
-                    if not data:
-                        self.server.log(f"⚠️ Client {self.key} closed connection")
+                    # Kernel copies page cache -> socket, no userspace buffers
+                    n = os.sendfile(self.sock.fileno(), item.f.fileno(), item.offset, item.remaining)
+                except (BlockingIOError, InterruptedError):
+                    raise
+                except OSError:
+                    # sendfile(2) refused this file/socket pair, use read()+send()
+                    item.use_sendfile = False
+                    item.f.seek(item.offset)
+                    continue
+                if not n:
+                    break  # file shrank while queued
+                item.offset += n
+                item.remaining -= n
+            else:
+                if not item.pending:
+                    item.pending = item.f.read(min(RECV_BUFFER, item.remaining))
+                    if not item.pending:
                         break
+                    item.offset += len(item.pending)
+                    item.remaining -= len(item.pending)
+                self._out_off += self.sock.send(memoryview(item.pending)[self._out_off:])
+                if self._out_off < len(item.pending):
+                    return False
+                item.pending = b""
+                self._out_off = 0
+        return True
+
+    # ---- Receiving ----
+
+    def _ensure_room(self, need):
+        """Make room for `need` more bytes after the unread region of the ring buffer"""
+        if self._tail + need <= len(self._rb):
+            return
+        unread = self._tail - self._head
+        if unread + need > len(self._rb):
+            # Grow into a fresh buffer so views handed out earlier stay valid
+            rb = bytearray(max(2 * len(self._rb), unread + need))
+            rb[:unread] = self._mv[self._head:self._tail]
+            self._rb = rb
+            self._mv = memoryview(rb)
+        elif unread:
+            # Wrap around: memmove the unread region back to index 0
+            self._mv[:unread] = self._mv[self._head:self._tail]
+        self._head = 0
+        self._tail = unread
+
+    def _recv_more(self):
+        """Receive straight into the ring buffer tail, returns bytes read (0 on EOF)"""
+        if self._frame_buf is not None:
+            # Never past the frame's end, so the next header stays in the socket
+            n = self.sock.recv_into(self._frame_mv[self._frame_off:])
+            self._frame_off += n
+            return n
+        self._ensure_room(RECV_BUFFER)
+        n = self.sock.recv_into(self._mv[self._tail:])
+        self._tail += n
+        return n
+
+    def on_readable(self):
+        """Receive what the socket has and advance the state machine (I/O thread)"""
+        try:
+            n = self._recv_more()
+        except (BlockingIOError, InterruptedError):
+            return
+        except Exception as e:
+            self.server.log(f"⚠️ Read error from {self.key}: {e}")
+            self._disconnect()
+            return
 
-                    buffer += data
-
-                    while b'\n' in buffer:
-                        line, buffer = buffer.split(b'\n', 1)
-                        header = line.decode('utf-8', errors='ignore').strip()
-                        if not header:
-                            continue
+        if not n:
+            self.server.log(f"⚠️ Client {self.key} closed connection")
+            self._disconnect()
+            return
 
-                        try:
-                            # Handle live screen frames (do NOT save)
-                            if header.upper() == "FRAME":
-                                # Read 8-byte size
-                                while len(buffer) < 8:
-                                    chunk = sock.recv(RECV_BUFFER)
-                                    if not chunk:
-                                        raise ConnectionError("Connection closed while reading frame size")
-                                    buffer += chunk
-
-                                size_bytes = buffer[:8]
-                                buffer = buffer[8:]
-                                size = struct.unpack(">Q", size_bytes)[0]
-
-                                if size <= 0 or size > MAX_IMAGE_SIZE:
-                                    self.server.log(f"⚠️ Invalid frame size from {self.key}: {size}")
-                                    continue
-
-                                # Read frame data
-                                while len(buffer) < size:
-                                    chunk = sock.recv(min(RECV_BUFFER, size - len(buffer)))
-                                    if not chunk:
-                                        raise ConnectionError("Connection closed while reading frame data")
-                                    buffer += chunk
-
-                                frame_data = buffer[:size]
-                                buffer = buffer[size:]
-
-                                # Only show on UI, never save
-                                self.last_image = frame_data
-                                self.last_image_ts = time.time()
-                                self.frames_received += 1
-                                self.bytes_received += len(frame_data)
-
-                                if hasattr(self.server, "signals"):
-                                    self.server.signals.new_frame.emit(self.key, frame_data)
-                                else:
-                                    self.server.on_client_frame(self.key, frame_data)
-
-                            elif header.upper() == "HEARTBEAT":
-                                self.last_heartbeat = time.time()
-
-                            elif header.upper().startswith("STATUS"):
-                                self.server.log(f"📊 Status from {self.key}: {header}")
-
-                            elif header.upper().startswith("MSG"):
-                                self.server.log(f"💬 Message from {self.key}: {header}")
-
-                            else:
-                                self.server.log(f"📢 From {self.key}: {header}")
-
-                        except Exception as header_error:
-                            self.server.log(f"⚠️ Error processing header '{header}' from {self.key}: {header_error}")
-                            continue
+        self.last_recv = time.time()
+        try:
+            self.feed()
+        except Exception as e:
+            self.server.log(f"❌ Handler error for {self.key}: {e}")
+            import traceback
+            self.server.log(f"Traceback: {traceback.format_exc()}")
+            self._disconnect()
+
+    def feed(self):
+        """Consume every complete message currently buffered"""
+        while self.connected:
+            state = self._state
+            available = self._tail - self._head
+
+            if state == STATE_HEADER or state == STATE_FILE_META:
+                rb = self._rb
+                nl = rb.find(b'\n', self._head, self._tail)
+                if nl < 0:
+                    return
+                line = self._mv[self._head:nl].tobytes()
+                head = nl + 1
+                if state == STATE_HEADER:
+                    if self.pending:
+                        self._head = head
+                        self._on_first_line(line)
+                        continue
+                    # Stream hot path: FRAME header and its size in one step
+                    if line == b"FRAME" and self._tail - head >= 8:
+                        self._head = head + 8
+                        self._on_frame_size(_U64_BE.unpack_from(rb, head)[0])
+                        continue
+                    self._head = head
+                    self._on_header(line)
+                else:
+                    self._head = head
+                    self._on_file_meta(line)
+
+            elif state == STATE_FRAME_SIZE or state == STATE_FILE_SIZE:
+                if available < 8:
+                    return
+                size = _U64_BE.unpack_from(self._rb, self._head)[0]
+                self._head += 8
+                if state == STATE_FRAME_SIZE:
+                    self._on_frame_size(size)
+                else:
+                    self._on_file_size(size)
+
+            elif state == STATE_FRAME_BODY:
+                if available < self._expect:
+                    if self._expect > MAX_FRAME_CHUNK:
+                        self._start_direct_frame(available)
+                        continue
+                    # Make sure the whole frame fits before more data arrives
+                    self._ensure_room(self._expect - available)
+                    return
+                frame_mv = self._mv[self._head:self._head + self._expect]
+                self._head += self._expect
+                self._state = STATE_HEADER
+                self._on_frame(frame_mv)
 
-                except socket.timeout:
-                    if time.time() - self.last_heartbeat > 60:
-                        self.server.log(f"⏱️ Client {self.key} timed out")
-                        break
-                    continue
+            elif state == STATE_FRAME_DIRECT:
+                if self._frame_off < self._expect:
+                    return
+                frame = self._frame_buf
+                self._frame_buf = self._frame_mv = None
+                self._state = STATE_HEADER
+                self._on_frame(frame)
+
+            elif state == STATE_FILE_BODY:
+                take = min(available, self._expect)
+                if take:
+                    self._write_file(self._mv[self._head:self._head + take])
+                    self._head += take
+                    self._expect -= take
+                if self._expect:
+                    return
+                self._state = STATE_HEADER
+                self._finish_file()
 
-                except Exception as e:
-                    self.server.log(f"⚠️ Read error from {self.key}: {e}")
-                    import traceback
-                    self.server.log(f"Traceback: {traceback.format_exc()}")
-                    break
+    # ✅ Handle live screen frames (do NOT save)
+    def _on_frame_header(self):
+        self._state = STATE_FRAME_SIZE
 
-        except Exception as e:
-            self.server.log(f"❌ Handler error for {self.key}: {e}")
-        finally:
-            self.running.clear()
-            self.client_info["status"] = "disconnected"
-            self.server.log(f"❌ {self.key} disconnected")
-            self.server.remove_client(self.key)
+    # ✅ Handle actual file transfers only (non-screen)
+    def _on_file_header(self):
+        self._state = STATE_FILE_META
 
-    def get_stats(self):
-        """Get client statistics"""
-        uptime = time.time() - self.connected_time
-        return {
-            "key": self.key,
-            "uptime": uptime,
-            "frames": self.frames_received,
-            "bytes": self.bytes_received,
-            "files": self.files_received,
-            "streaming": self.is_streaming,
-            "status": self.client_info["status"]
-        }
+    def _on_heartbeat(self):
+        self.last_heartbeat = time.time()
 
+    # Exact-match commands; looked up as sent, then upper-cased
+    _HEADERS = {
+        b"FRAME": _on_frame_header,
+        b"FILE": _on_file_header,
+        b"FILE_BACK": _on_file_header,
+        b"HEARTBEAT": _on_heartbeat,
+        b"HELLO": _on_heartbeat,  # a client's first line, so it's listed right away
+    }
+
+    def _start_direct_frame(self, available):
+        """Move a large frame's buffered prefix into a pre-sized buffer"""
+        self._frame_buf = bytearray(self._expect)
+        self._frame_mv = memoryview(self._frame_buf)
+        self._frame_mv[:available] = self._mv[self._head:self._tail]
+        self._frame_off = available
+        self._head = self._tail = 0
+        self._state = STATE_FRAME_DIRECT
+
+    def _on_first_line(self, line):
+        """Classify a new connection by its first line: client or bulk channel"""
+        stripped = line.strip()
+        if not stripped:
+            return
+        self.pending = False
+        if stripped.startswith(b"BULK:"):
+            self.server.attach_bulk(self, stripped[5:].decode('ascii', errors='ignore'))
+            return
+        self.server.register_client(self)
+        self._on_header(line)
 
-    def _reader_loop(self):
-        """Read data from client"""
-        sock = self.sock
-        sock.settimeout(30.0)
+    def _on_header(self, line):
+        line = line.strip()
+        if not line:
+            return
 
         try:
-            buffer = b""
-            while self.running.is_set():
-                try:
-                    data = sock.recv(RECV_BUFFER)
-                    if not data:
-                        self.server.log(f"⚠️ Client {self.key} closed connection")
-                        break
+            handler = self._HEADERS.get(line) or self._HEADERS.get(line.upper())
+            if handler is not None:
+                handler(self)
+                return
 
-                    buffer += data
+            header = line.decode('utf-8', errors='ignore')
+            command = line[:6].upper()
+            if command.startswith(b"STATUS"):
+                self.server.log(f"📊 Status from {self.key}: {header}")
 
-                    while b'\n' in buffer:
-                        line, buffer = buffer.split(b'\n', 1)
-                        header = line.decode('utf-8', errors='ignore').strip()
-                        if not header:
-                            continue
+            elif command.startswith(b"MSG"):
+                self.server.log(f"💬 Message from {self.key}: {header}")
 
-                        try:
-                            # ✅ Handle live screen frames (do NOT save)
-                            if header.upper() == "FRAME":
-                                # Read 8-byte size
-                                while len(buffer) < 8:
-                                    chunk = sock.recv(RECV_BUFFER)
-                                    if not chunk:
-                                        raise ConnectionError("Connection closed while reading frame size")
-                                    buffer += chunk
-
-                                size_bytes = buffer[:8]
-                                buffer = buffer[8:]
-                                size = struct.unpack(">Q", size_bytes)[0]
-
-                                if size <= 0 or size > MAX_IMAGE_SIZE:
-                                    self.server.log(f"⚠️ Invalid frame size from {self.key}: {size}")
-                                    continue
-
-                                # Read frame data
-                                while len(buffer) < size:
-                                    chunk = sock.recv(min(RECV_BUFFER, size - len(buffer)))
-                                    if not chunk:
-                                        raise ConnectionError("Connection closed while reading frame data")
-                                    buffer += chunk
-
-                                frame_data = buffer[:size]
-                                buffer = buffer[size:]
-
-                                # ✅ Only show on UI, never save
-                                self.last_image = frame_data
-                                self.last_image_ts = time.time()
-                                self.frames_received += 1
-                                self.bytes_received += len(frame_data)
-
-                                if hasattr(self.server, "signals"):
-                                    self.server.signals.new_frame.emit(self.key, frame_data)
-                                else:
-                                    self.server.on_client_frame(self.key, frame_data)
-
-                            # ✅ Handle actual file transfers only (non-screen)
-                            elif header.upper() in ("FILE", "FILE_BACK"):
-                                # Peek at metadata to skip screen captures
-                                peek = buffer[:200].lower()
-                                if b".jpg" in peek or b".jpeg" in peek or b"frame" in peek:
-                                    self.server.log(f"🚫 Skipped screen frame pretending to be file from {self.key}")
-                                    # discard data instead of saving
-                                    buffer = b""
-                                    continue
-
-                                # otherwise handle normal file
-                                self._receive_file_from_buffer(sock, buffer)
-                                buffer = b""
-
-                            elif header.upper() == "HEARTBEAT":
-                                self.last_heartbeat = time.time()
-
-                            elif header.upper().startswith("STATUS"):
-                                self.server.log(f"📊 Status from {self.key}: {header}")
-
-                            elif header.upper().startswith("MSG"):
-                                self.server.log(f"💬 Message from {self.key}: {header}")
-
-                            else:
-                                self.server.log(f"📝 From {self.key}: {header}")
-
-                        except Exception as header_error:
-                            self.server.log(f"⚠️ Error processing header '{header}' from {self.key}: {header_error}")
-                            continue
+            else:
+                self.server.log(f"📝 From {self.key}: {header}")
 
-                except socket.timeout:
-                    if time.time() - self.last_heartbeat > 60:
-                        self.server.log(f"⏱️ Client {self.key} timed out")
-                        break
-                    continue
+        except Exception as header_error:
+            self.server.log(f"⚠️ Error processing header {line!r} from {self.key}: {header_error}")
 
-                except Exception as e:
-                    self.server.log(f"⚠️ Read error from {self.key}: {e}")
-                    import traceback
-                    self.server.log(f"Traceback: {traceback.format_exc()}")
-                    break
+    def _on_frame_size(self, size):
+        if size <= 0 or size > MAX_IMAGE_SIZE:
+            self.server.log(f"⚠️ Invalid frame size from {self.key}: {size}")
+            self._state = STATE_HEADER
+            return
+        self._expect = size
+        self._state = STATE_FRAME_BODY
+
+    def _on_frame(self, frame):
+        # Shown on UI; saved only when a snapshot was requested
+        save, self._save_next_frame = self._save_next_frame, False
+        self.last_image = self.server.on_client_frame(self, frame, save)
+        self.last_image_ts = time.time()
+        self.frames_received += 1
+        self.bytes_received += len(frame)
+
+    def _on_file_meta(self, meta_line):
+        metadata = {}
+        try:
+            meta_str = meta_line.decode('utf-8', errors='ignore').strip()
+            if meta_str:
+                metadata = json.loads(meta_str)
+        except:
+            metadata = {"filename": meta_line.decode('utf-8', errors='ignore')}
+        self._file_meta = (metadata, meta_line.lower())
+        self._state = STATE_FILE_SIZE
+
+    def _on_file_size(self, filesize):
+        metadata, raw_meta = self._file_meta
+        self._file_meta = None
+
+        if filesize > 10 * 1024 * 1024 * 1024:
+            self.server.log(f"⚠️ Invalid file size from {self.key}: {filesize}")
+            self._state = STATE_HEADER
+            return
 
+        # The body is consumed either way; self._file stays None when it is discarded
+        self._expect = filesize
+        self._state = STATE_FILE_BODY
+
+        # Skip screen captures sent as files
+        if b".jpg" in raw_meta or b".jpeg" in raw_meta or b"frame" in raw_meta:
+            self.server.log(f"🚫 Skipped screen frame pretending to be file from {self.key}")
+            return
+
+        # Generate filename
+        fname = metadata.get("filename") or f"{self.safe_key}_{int(time.time())}"
+        fname = os.path.basename(fname)
+        
+        outpath = os.path.join(INBOX_DIR, fname)
+        tmp_path = outpath + ".part"
+        
+        self.server.log(f"📥 Receiving file from {self.key}: {fname} ({format_bytes(filesize)})")
+        try:
+            resume = lambda: self.server.call_soon(lambda: self._set_reading(True))
+            sink = _FileSink(self.server.disk_pool, open_preallocated(tmp_path, filesize), resume)
+            self._file = (sink, tmp_path, outpath, fname, metadata)
         except Exception as e:
-            self.server.log(f"❌ Handler error for {self.key}: {e}")
-        finally:
-            self.running.clear()
-            self.client_info["status"] = "disconnected"
-            self.server.log(f"❌ {self.key} disconnected")
-            self.server.remove_client(self.key)
+            self.server.log(f"❌ File receive error from {self.key}: {e}")
 
-            
-    def _receive_file_from_buffer(self, sock, initial_buffer):
-        """Receive file data"""
+    def _write_file(self, data):
+        if self._file is None:
+            return
+        # The ring is reused, so the sink gets its own copy
+        if self._file[0].write(bytes(data)):
+            self._set_reading(False)
+
+    def _finish_file(self):
+        if self._file is None:
+            return
+        sink, tmp_path, outpath, fname, metadata = self._file
+        self._file = None
+        sink.finish(lambda error: self._file_done(error, tmp_path, outpath, fname, metadata))
+
+    def _file_done(self, error, tmp_path, outpath, fname, metadata):
+        """Rename the finished upload into place (disk pool)"""
         try:
-            buffer = initial_buffer
-            
-            # Read metadata line
-            while b'\n' not in buffer:
-                chunk = sock.recv(RECV_BUFFER)
-                if not chunk:
-                    return
-                buffer += chunk
-            
-            meta_line, buffer = buffer.split(b'\n', 1)
-            metadata = {}
-            try:
-                meta_str = meta_line.decode('utf-8', errors='ignore').strip()
-                if meta_str:
-                    metadata = json.loads(meta_str)
-            except:
-                metadata = {"filename": meta_line.decode('utf-8', errors='ignore')}
-            
-            # Read file size (8 bytes)
-            while len(buffer) < 8:
-                chunk = sock.recv(RECV_BUFFER)
-                if not chunk:
-                    return
-                buffer += chunk
-            
-            size_bytes = buffer[:8]
-            buffer = buffer[8:]
-            filesize = struct.unpack(">Q", size_bytes)[0]
-            
-            if filesize < 0 or filesize > 10 * 1024 * 1024 * 1024:
-                self.server.log(f"⚠️ Invalid file size from {self.key}: {filesize}")
-                return
-            
-            # Generate filename
-            fname = metadata.get("filename") or f"{self.key.replace(':','_')}_{int(time.time())}"
-            fname = os.path.basename(fname)
-
-            # # 🚫 Ignore screenshots or JPEG frames
-            # if fname.lower().endswith((".jpg", ".jpeg")) or "frame" in fname.lower():
-            #     self.server.log(f"🚫 Ignored incoming screen frame file from {self.key}: {fname}")
-            #     # Read and discard data instead of saving it
-            #     remaining = filesize
-            #     while remaining > 0:
-            #         chunk = sock.recv(min(RECV_BUFFER, remaining))
-            #         if not chunk:
-            #             break
-            #         remaining -= len(chunk)
-            #     return  # Skip saving
-            
-            outpath = os.path.join(INBOX_DIR, fname)
-            tmp_path = outpath + ".part"
-            
-            self.server.log(f"📥 Receiving file from {self.key}: {fname} ({format_bytes(filesize)})")
-            
-            # Write file
-            with open(tmp_path, "wb") as outf:
-                to_write = min(len(buffer), filesize)
-                outf.write(buffer[:to_write])
-                remaining = filesize - to_write
-                
-                # Read rest of file
-                while remaining > 0:
-                    chunk = sock.recv(min(RECV_BUFFER, remaining))
-                    if not chunk:
-                        raise ConnectionError("Connection closed during file transfer")
-                    outf.write(chunk)
-                    remaining -= len(chunk)
+            if error:
+                raise error
             
             # Move to final location
             try:
@@ -527,12 +884,40 @@ class ClientHandler:
             
         except Exception as e:
             self.server.log(f"❌ File receive error from {self.key}: {e}")
-            try:
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
-            except:
-                pass
+            self._remove_partial(tmp_path)
 
+    def _abort_file(self):
+        """Drop a partially received file"""
+        if self._file is None:
+            return
+        sink, tmp_path = self._file[0], self._file[1]
+        self._file = None
+        sink.abort(lambda error: self._remove_partial(tmp_path))
+
+    @staticmethod
+    def _remove_partial(tmp_path):
+        try:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        except:
+            pass
+
+    def check_timeout(self, now):
+        """Drop clients that went silent (I/O thread)"""
+        if now - self.last_recv > 30 and now - self.last_heartbeat > 60:
+            self.server.log(f"⏱️ Client {self.key} timed out")
+            self._disconnect()
+
+    def check_bulk_timeout(self, now):
+        """Drop a bulk channel that stalled mid-upload (I/O thread)
+
+        Heartbeats only arrive on the control connection, so this is a plain
+        idle timeout on last_recv. A bulk channel waiting between uploads is
+        legitimately silent (pushes to the client go the other way) and is kept.
+        """
+        if self._state != STATE_HEADER and now - self.last_recv > BULK_IDLE_TIMEOUT:
+            self.server.log(f"⏱️ Bulk channel {self.key} stalled mid-upload")
+            self._disconnect()
 
     def get_stats(self):
         """Get client statistics"""
@@ -549,19 +934,50 @@ class ClientHandler:
 
 
 # ============ Admin Server ============
-class AdminServer:
+class AdminServer(QObject):
     """Enhanced admin server with improved management"""
     
+    # Emitted (from the I/O thread) when a client's frame slot goes from empty to full
+    frame_ready = pyqtSignal(str)
+    # Emitted with the new active count whenever a client is added or removed
+    clients_changed = pyqtSignal(int)
+    # Emitted when log_ring gets lines while no drain is pending
+    log_added = pyqtSignal()
+    # Emitted after a file or screenshot lands in INBOX_DIR
+    inbox_changed = pyqtSignal()
+    
     def __init__(self, host=LISTEN_HOST, port=LISTEN_PORT):
+        super().__init__()
         self.host = host
         self.port = port
         self.sock = None
-        self.accept_thread = None
+        self.selector = None
+        self.io_thread = None
         self.running = threading.Event()
         self.clients = {}  # key -> ClientHandler
         self.clients_lock = threading.Lock()
-        self.log_queue = Queue()
-        self.frame_queue = Queue()
+        # Immutable views rebuilt on every add/remove, read without the lock
+        self._clients_snapshot = ()  # ClientHandler, ...
+        self._client_keys = ()  # sorted keys
+        self.clients_version = 0  # bumped with every rebuild of the views
+        self._by_client_id = {}  # client_id token -> control ClientHandler
+        self.log_ring = deque(maxlen=LOG_RING_SIZE)  # (time.time(), msg); append/popleft are thread-safe
+        self.log_signalled = False  # log_added is pending; the consumer clears it before draining
+        self.latest_frames = {}  # key -> newest frame bytes, older frames are dropped
+        self.frames_lock = threading.Lock()
+        self.is_streaming_save_enabled = False  # persist every stream frame (off by default)
+        self.latest_frame_file = {}  # key -> path of the newest saved screenshot
+        self.disk_pool = ThreadPoolExecutor(max_workers=4)  # keeps disk writes off the I/O thread
+
+        # Work handed to the I/O thread from other threads
+        self._io_lock = threading.Lock()
+        self._calls = deque()
+        self._flush = set()
+        self._wake_r = None
+        self._wake_w = None
+        self._woken = False
+        # Accepted connections that haven't sent their first line yet (I/O thread)
+        self._pending = set()
         
         # Statistics
         self.total_connections = 0
@@ -575,61 +991,182 @@ class AdminServer:
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            # Accepted sockets inherit this; it has to be set before the handshake
+            # for the larger receive window to be advertised
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER)
             self.sock.bind((self.host, self.port))
             self.sock.listen(200)
+            self.sock.setblocking(False)
+
+            # Other threads poke the wake socket when they queue output
+            self._wake_r, self._wake_w = socket.socketpair()
+            self._wake_r.setblocking(False)
+            self._wake_w.setblocking(False)
+
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.sock, selectors.EVENT_READ, None)
+            self.selector.register(self._wake_r, selectors.EVENT_READ, self)
+
             self.running.set()
             self.start_time = time.time()
             
-            self.accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
-            self.accept_thread.start()
+            self.io_thread = threading.Thread(target=self._io_loop, daemon=True)
+            self.io_thread.start()
             
             self.log(f"🚀 Server started on {self.host}:{self.port}")
             return True
         except Exception as e:
             self.log(f"❌ Failed to start server: {e}")
+            self._close_io()
             return False
 
     def stop(self):
         """Stop the server"""
         self.running.clear()
+        self._woken = False
+        self._wakeup()
         
-        try:
-            if self.sock:
-                self.sock.close()
-        except:
-            pass
-        
-        with self.clients_lock:
-            keys = list(self.clients.keys())
+        # The I/O thread disconnects every client on its way out
+        if self.io_thread and self.io_thread is not threading.current_thread():
+            self.io_thread.join(timeout=2.0)
         
-        for k in keys:
+        self.log("🛑 Server stopped")
+
+    def _close_io(self):
+        for s in (self.selector, self.sock, self._wake_r, self._wake_w):
             try:
-                self.clients[k].stop()
+                if s:
+                    s.close()
             except:
                 pass
-        
-        self.log("🛑 Server stopped")
+        self.selector = self.sock = self._wake_r = self._wake_w = None
+
+    def _io_loop(self):
+        """Single thread doing accepts, reads and writes for every client"""
+        last_sweep = time.time()
+        try:
+            while self.running.is_set():
+                for key, mask in self.selector.select(timeout=1.0):
+                    obj = key.data
+                    if obj is None:
+                        self._accept()
+                    elif obj is self:
+                        self._drain_wakeups()
+                    elif obj.connected:
+                        if mask & selectors.EVENT_READ:
+                            obj.on_readable()
+                        if mask & selectors.EVENT_WRITE and obj.connected:
+                            obj.on_writable()
+
+                self._run_pending()
+
+                now = time.time()
+                if now - last_sweep >= 5.0:
+                    last_sweep = now
+                    for handler in self._clients_snapshot:
+                        handler.check_timeout(now)
+                        # Bulk handlers aren't listed as clients; check them here
+                        bulk = handler.bulk
+                        if bulk is not None and bulk.connected:
+                            bulk.check_bulk_timeout(now)
+                    for handler in tuple(self._pending):
+                        handler.check_timeout(now)
+        except Exception as e:
+            if self.running.is_set():
+                self.log(f"❌ I/O loop error: {e}")
+        finally:
+            self.running.clear()
+            for handler in self._clients_snapshot:
+                handler._disconnect()
+            for handler in tuple(self._pending):
+                handler.close()
+            self._close_io()
 
-    def _accept_loop(self):
+    def _accept(self):
         """Accept incoming connections"""
-        while self.running.is_set():
+        while True:
             try:
                 conn, addr = self.sock.accept()
-                key = f"{addr[0]}:{addr[1]}"
-                
-                handler = ClientHandler(conn, addr, self)
-                handler.start()
-                
-                with self.clients_lock:
-                    self.clients[key] = handler
-                
-                self.total_connections += 1
-                self.log(f"✅ Client connected: {key} (Total active: {len(self.clients)})")
-                
+            except (BlockingIOError, InterruptedError):
+                return
             except Exception as e:
                 if self.running.is_set():
                     self.log(f"⚠️ Accept error: {e}")
-                break
+                return
+
+            conn.setblocking(False)
+            tune_socket(conn)
+            handler = ClientHandler(conn, addr, self)
+            self.selector.register(conn, selectors.EVENT_READ, handler)
+            # Not a client yet: its first line may make it a bulk channel
+            self._pending.add(handler)
+
+    def register_client(self, handler):
+        """List a connection whose first line showed it's a client (I/O thread)"""
+        self._pending.discard(handler)
+        key = handler.key
+        with self.clients_lock:
+            self.clients[key] = handler
+            self._by_client_id[handler.client_id] = handler
+            self._publish_clients()
+        handler.queue_send(f"CLIENT_ID:{handler.client_id}\n".encode())
+
+        self.total_connections += 1
+        self.log(f"✅ Client connected: {key} (Total active: {len(self._clients_snapshot)})")
+
+    def _wakeup(self):
+        # One byte per loop pass is enough: a broadcast to N clients wakes the loop once
+        if self._woken:
+            return
+        self._woken = True
+        try:
+            if self._wake_w:
+                self._wake_w.send(b"\0")
+        except OSError:
+            pass  # already awake (buffer full) or shutting down
+
+    def _drain_wakeups(self):
+        # Cleared before _run_pending() swaps the queues, so no request is missed
+        self._woken = False
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except OSError:
+            pass
+
+    def call_soon(self, fn):
+        """Run fn on the I/O thread (directly if the loop is not running)"""
+        if not (self.io_thread and self.io_thread.is_alive()):
+            fn()
+            return
+        with self._io_lock:
+            self._calls.append(fn)
+        self._wakeup()
+
+    def request_flush(self, *handlers):
+        """Ask the I/O thread to send the handlers' newly queued output"""
+        with self._io_lock:
+            self._flush.update(handlers)
+        self._wakeup()
+
+    def _run_pending(self):
+        with self._io_lock:
+            calls, self._calls = self._calls, deque()
+            flush, self._flush = self._flush, set()
+        for fn in calls:
+            try:
+                fn()
+            except Exception as e:
+                self.log(f"⚠️ I/O task error: {e}")
+        for handler in flush:
+            if handler.connected:
+                handler.on_writable()
+
+    def unregister(self, sock):
+        try:
+            self.selector.unregister(sock)
+        except (KeyError, ValueError, AttributeError):
+            pass
 
     def remove_client(self, key):
         """Remove disconnected client"""
@@ -639,81 +1176,262 @@ class AdminServer:
                     self.clients[key].stop()
                 except:
                     pass
+                self._by_client_id.pop(self.clients[key].client_id, None)
                 del self.clients[key]
+                self._publish_clients()
+                with self.frames_lock:
+                    self.latest_frames.pop(key, None)
                 self.log(f"🗑️ Removed client: {key} (Remaining: {len(self.clients)})")
 
+    def attach_bulk(self, handler, client_id):
+        """Turn a new connection into the bulk channel of the client owning `client_id`"""
+        self._pending.discard(handler)
+        with self.clients_lock:
+            control = self._by_client_id.get(client_id)
+
+        if control is None or not control.connected or control.bulk is not None:
+            self.log(f"⚠️ Rejected bulk channel from {handler.key}")
+            handler.close()
+            return
+        handler.control = control
+        control.bulk = handler
+        self.log(f"🔗 Bulk channel for {control.key}: {handler.key}")
+
+    def _publish_clients(self):
+        """Rebuild the lock-free client views; call with clients_lock held"""
+        self._clients_snapshot = tuple(self.clients.values())
+        self._client_keys = tuple(sorted(self.clients))
+        self.clients_version += 1
+        self.clients_changed.emit(len(self._clients_snapshot))
+
     def broadcast_command(self, cmd_str: str):
         """Send command to all connected clients"""
-        with self.clients_lock:
-            clients = list(self.clients.values())
+        clients = self._clients_snapshot
 
-        success = 0
+        # Encode once; every client gets the same payload on the next loop pass
+        data = (cmd_str + "\n").encode()
+        queued = []
         for handler in clients:
-            try:
-                # Send properly encoded command with newline
-                handler.client_socket.sendall((cmd_str + "\n").encode())
-                success += 1
-            except Exception as e:
-                self.log(f"❌ Failed to send '{cmd_str}' to a client: {e}")
+            if handler._enqueue(data, flush=False):
+                queued.append(handler)
+            else:
+                self.log(f"❌ Failed to send '{cmd_str}' to {handler.key}: not connected")
+        # One hand-off to the I/O thread for the whole batch
+        if queued:
+            self.request_flush(*queued)
+        success = len(queued)
 
         self.log(f"📢 Broadcast '{cmd_str}' to {success}/{len(clients)} clients")
 
+    def send_command_to(self, keys, cmd_str: str):
+        """Send command to the given clients; returns how many it was queued for"""
+        handlers = self.snapshot_clients(keys)
+
+        # Enqueue outside the lock so accepts and disconnects never wait on a fan-out
+        data = (cmd_str + "\n").encode()
+        queued = []
+        for handler in handlers:
+            if handler._enqueue(data, flush=False):
+                queued.append(handler)
+            else:
+                self.log(f"❌ Failed to send '{cmd_str}' to {handler.key}: not connected")
+        if queued:
+            self.request_flush(*queued)
+        return len(queued)
+
 
     def send_file_to_clients(self, filepath: str, keys: list):
         """Send file to specific clients"""
-        with self.clients_lock:
-            for k in keys:
-                if k in self.clients:
-                    threading.Thread(
-                        target=self.clients[k].send_file,
-                        args=(filepath,),
-                        daemon=True
-                    ).start()
+        for handler in self.snapshot_clients(keys):
+            threading.Thread(
+                target=handler.send_file,
+                args=(filepath,),
+                daemon=True
+            ).start()
 
     def log(self, msg: str):
-        """Add message to log queue"""
-        timestamp = now_ts()
-        self.log_queue.put(f"[{timestamp}] {msg}")
+        """Add message to log ring; the GUI formats the timestamp when it drains"""
+        self.log_ring.append((time.time(), msg))
+        if not self.log_signalled:
+            self.log_signalled = True
+            self.log_added.emit()
+
+    def on_client_frame(self, handler: ClientHandler, frame, save: bool = False):
+        """Handle received frame — display, and save only snapshots
+
+        `frame` is either a memoryview into the handler's receive ring, only
+        valid during this call and copied exactly once here, or a bytearray
+        the handler has handed over, which is kept as is.
+        """
+        try:
+            image_bytes = frame if isinstance(frame, bytearray) else frame.tobytes()
+            # Keep only the newest frame per client for live viewing
+            with self.frames_lock:
+                was_empty = handler.key not in self.latest_frames
+                self.latest_frames[handler.key] = image_bytes
+            # One signal per filled slot; later frames just replace the pending one
+            if was_empty:
+                self.frame_ready.emit(handler.key)
+            if save:
+                self.disk_pool.submit(self._save_frame, handler, image_bytes)
+            elif self.is_streaming_save_enabled:
+                self._record_frame(handler, image_bytes)
+            return image_bytes
+        except Exception as e:
+            self.log(f"❌ Error handling live frame from {handler.key}: {e}")
+            return None
 
-    def on_client_frame(self, client_key: str, image_bytes: bytes):
-        """Handle received frame — display only, do NOT save to disk"""
+    def _save_frame(self, handler: ClientHandler, image_bytes: bytes):
+        """Write a frame to the inbox (runs on disk_pool)"""
+        fname = f"{handler.safe_key}_frame_{int(time.time() * 1000)}.jpg"
         try:
-            # Just forward to frame queue or signal for live viewing
-            self.frame_queue.put((client_key, image_bytes))
-            # (No file saving)
+            path = os.path.join(INBOX_DIR, fname)
+            with open(path, "wb") as f:
+                f.write(image_bytes)
+            self.latest_frame_file[handler.key] = path
+            self.inbox_changed.emit()
+            self.log(f"📸 Saved screenshot from {handler.key}: {fname}")
         except Exception as e:
-            self.log(f"❌ Error handling live frame from {client_key}: {e}")
+            self.log(f"❌ Error saving frame from {handler.key}: {e}")
+
+    def _record_frame(self, handler: ClientHandler, image_bytes):
+        """Append a frame to the client's .mjpg recording (I/O thread)
+
+        The file is a run of 8-byte big-endian lengths, each followed by one
+        JPEG. It is opened once per connection, and each frame is written
+        with a single vectored write.
+        """
+        sink = handler._stream_sink
+        if sink is None:
+            path = os.path.join(INBOX_DIR, f"{handler.safe_key}.mjpg")
+            try:
+                sink = _FileSink(self.disk_pool, open(path, "ab", buffering=0))
+            except Exception as e:
+                self.log(f"❌ Error recording stream from {handler.key}: {e}")
+                return
+            handler._stream_sink = sink
+        if sink.throttled:
+            return  # disk is behind; drop frames rather than queue them
+        sink.write((_U64_BE.pack(len(image_bytes)), image_bytes))
+
+    def offer_latest_frame(self, client_key: str, image_bytes):
+        """Fill a client's frame slot unless a newer frame is already pending"""
+        with self.frames_lock:
+            self.latest_frames.setdefault(client_key, image_bytes)
+
+    def pop_latest_frame(self, client_key: str):
+        """Take the newest pending frame for one client, or None"""
+        with self.frames_lock:
+            return self.latest_frames.pop(client_key, None)
 
     def on_client_file(self, client_key: str, filepath: str, metadata: dict):
         """Handle received file"""
         self.log(f"📁 File received from {client_key}: {os.path.basename(filepath)}")
+        self.inbox_changed.emit()
 
     def list_clients(self):
         """Get list of connected clients"""
+        return list(self._client_keys)
+
+    def snapshot_clients(self, keys):
+        """Handlers for the connected ones among `keys`; act on them without the lock"""
         with self.clients_lock:
-            return sorted(list(self.clients.keys()))
+            clients = self.clients
+            return [clients[k] for k in keys if k in clients]
 
     def get_client_stats(self, key):
         """Get statistics for a client"""
         with self.clients_lock:
-            if key in self.clients:
-                return self.clients[key].get_stats()
-        return None
+            handler = self.clients.get(key)
+        return handler.get_stats() if handler else None
 
     def get_server_stats(self):
         """Get server statistics"""
         uptime = time.time() - self.start_time if self.start_time else 0
-        with self.clients_lock:
-            active_clients = len(self.clients)
-        
         return {
             "uptime": uptime,
-            "active_clients": active_clients,
+            "active_clients": len(self._clients_snapshot),
             "total_connections": self.total_connections
         }
 
 
 # ============ Admin GUI ============
+class _DecodeSignals(QObject):
+    decoded = pyqtSignal(str, QImage, bool)  # (client key, scaled image or null, smooth)
+
+
+class FrameDecoder(QRunnable):
+    """Decode and scale one preview JPEG on the thread pool"""
+
+    def __init__(self, key, jpeg, size, signals, smooth=False):
+        super().__init__()
+        self.key = key
+        self.jpeg = jpeg
+        self.size = size
+        self.signals = signals
+        self.smooth = smooth  # bilinear scaling, for a still image
+
+    def run(self):
+        # QPixmap is GUI-thread only, so decode to a QImage here; fromData takes
+        # the bytes as-is and the format hint skips autodetection
+        img = QImage.fromData(self.jpeg, "JPG")
+        if not img.isNull():
+            mode = Qt.SmoothTransformation if self.smooth else Qt.FastTransformation
+            img = img.scaled(self.size, Qt.KeepAspectRatio, mode)
+        self.signals.decoded.emit(self.key, img, self.smooth)
+
+
+class _InboxSignals(QObject):
+    scanned = pyqtSignal(list)  # [(name, size), ...] newest name first
+    cleared = pyqtSignal(int)  # number of files deleted, -1 if INBOX_DIR couldn't be listed
+
+
+class InboxScanner(QRunnable):
+    """List INBOX_DIR with os.scandir on the thread pool"""
+
+    def __init__(self, signals):
+        super().__init__()
+        self.signals = signals
+
+    def run(self):
+        entries = []
+        try:
+            with os.scandir(INBOX_DIR) as it:
+                for e in it:
+                    try:
+                        entries.append((e.name, e.stat().st_size))
+                    except OSError:
+                        pass  # removed while scanning
+        except OSError:
+            pass
+        entries.sort(reverse=True)
+        self.signals.scanned.emit(entries)
+
+
+class InboxCleaner(QRunnable):
+    """Delete every file in INBOX_DIR on the thread pool"""
+
+    def __init__(self, signals):
+        super().__init__()
+        self.signals = signals
+
+    def run(self):
+        count = 0
+        try:
+            with os.scandir(INBOX_DIR) as it:
+                for e in it:
+                    try:
+                        # File type comes from the directory entry, no extra stat
+                        if e.is_file(follow_symlinks=False):
+                            os.remove(e.path)
+                            count += 1
+                    except OSError:
+                        pass
+        except OSError:
+            count = -1
+        self.signals.cleared.emit(count)
+
+
 class AdminWindow(QMainWindow):
     """Enhanced admin window with modern UI"""
     
@@ -802,6 +1520,32 @@ class AdminWindow(QMainWindow):
         self.server = AdminServer()
         self.selected_preview_client = None
         
+        # Preview frames are decoded off the GUI thread, one at a time
+        self.decode_pool = QThreadPool(self)
+        self.decode_pool.setMaxThreadCount(1)
+        self.decode_signals = _DecodeSignals()
+        self.decode_signals.decoded.connect(self._on_frame_decoded, Qt.QueuedConnection)
+        self._decoding = False
+        self._preview_src = None  # (key, jpeg bytes, label size) last sent to the decoder
+        self._last_uptime_s = -1  # status bar values last shown
+        self._last_client_count = -1
+        self._clients_version = -1  # server.clients_version shown in lst_clients
+        
+        # Once frames stop arriving, the last one is re-scaled smoothly
+        self.timer_preview_smooth = QTimer(self)
+        self.timer_preview_smooth.setSingleShot(True)
+        self.timer_preview_smooth.setInterval(500)
+        self.timer_preview_smooth.timeout.connect(self._smooth_preview)
+        
+        # Inbox listing runs on the global pool and reports back by signal
+        self.inbox_signals = _InboxSignals()
+        self.inbox_signals.scanned.connect(self._on_inbox_scanned, Qt.QueuedConnection)
+        self.inbox_signals.cleared.connect(self._on_inbox_cleared, Qt.QueuedConnection)
+        self._inbox_clearing = False
+        self._inbox_scanning = False
+        self._inbox_rescan = False  # refresh asked for while a scan was running
+        self._inbox_mtime = 0  # INBOX_DIR st_mtime_ns at the last scan
+        
         self._build_ui()
         self._start_timers()
         
@@ -922,7 +1666,7 @@ class AdminWindow(QMainWindow):
         monitor_layout = QVBoxLayout(monitor_group)
         
         btn_screenshot = QPushButton("📸 Request Screenshot")
-        btn_screenshot.clicked.connect(lambda: self.send_to_selected("REQUEST_SCREEN"))
+        btn_screenshot.clicked.connect(self.request_screenshot_selected)
         monitor_layout.addWidget(btn_screenshot)
         
         btn_start_stream = QPushButton("▶️ Start Live View")
@@ -1006,7 +1750,8 @@ class AdminWindow(QMainWindow):
 
     def update_preview(self, client_key, data):
         pixmap = QPixmap()
-        pixmap.loadFromData(data)
+        if not pixmap.loadFromData(data, "JPG"):
+            return
         scaled = pixmap.scaled(
             self.lbl_preview.size(),
             Qt.KeepAspectRatio,
@@ -1057,6 +1802,7 @@ class AdminWindow(QMainWindow):
         self.txt_log = QTextEdit()
         self.txt_log.setReadOnly(True)
         self.txt_log.setFont(QFont("Consolas", 10))
+        self.txt_log.document().setMaximumBlockCount(LOG_VIEW_MAX_LINES)
         layout.addWidget(self.txt_log)
         
         # Log controls
@@ -1077,29 +1823,24 @@ class AdminWindow(QMainWindow):
 
     def _start_timers(self):
         """Start update timers"""
-        # Log drain timer
+        # Log lines, clients and inbox changes are pushed by the server; queued
+        # connections run the slots on the GUI thread. A short single-shot timer
+        # coalesces log bursts into one view update.
         self.timer_log = QTimer(self)
-        self.timer_log.setInterval(200)
+        self.timer_log.setSingleShot(True)
+        self.timer_log.setInterval(50)
         self.timer_log.timeout.connect(self._drain_logs)
-        self.timer_log.start()
-        
-        # Clients refresh timer
-        self.timer_clients = QTimer(self)
-        self.timer_clients.setInterval(2000)
-        self.timer_clients.timeout.connect(self.refresh_clients)
-        self.timer_clients.start()
-        
-        # Inbox refresh timer
-        self.timer_inbox = QTimer(self)
-        self.timer_inbox.setInterval(3000)
-        self.timer_inbox.timeout.connect(self.refresh_inbox)
-        self.timer_inbox.start()
-        
-        # Frame update timer
-        self.timer_frames = QTimer(self)
-        self.timer_frames.setInterval(100)
-        self.timer_frames.timeout.connect(self._update_frames)
-        self.timer_frames.start()
+        self.server.log_added.connect(self.timer_log.start, Qt.QueuedConnection)
+        self.server.inbox_changed.connect(self.refresh_inbox, Qt.QueuedConnection)
+        
+        # Frames are pushed by the server; queued so the slot runs on the GUI thread
+        self.server.frame_ready.connect(self._on_frame_ready, Qt.QueuedConnection)
+        self.server.clients_changed.connect(self._on_clients_changed, Qt.QueuedConnection)
+        
+        # Pick up anything that happened before the connections existed
+        self._drain_logs()
+        self.refresh_clients()
+        self.refresh_inbox()
         
         # Status update timer
         self.timer_status = QTimer(self)
@@ -1108,42 +1849,88 @@ class AdminWindow(QMainWindow):
         self.timer_status.start()
 
     def _drain_logs(self):
-        """Drain log queue"""
-        while True:
-            try:
-                msg = self.server.log_queue.get_nowait()
-                self.txt_log.append(msg)
-                # Auto-scroll
-                scrollbar = self.txt_log.verticalScrollBar()
+        """Drain log ring"""
+        ring = self.server.log_ring
+        # Lines logged from here on raise log_added again
+        self.server.log_signalled = False
+        msgs = []
+        # Bounded so a log storm can't hold the GUI thread; the rest waits a tick
+        while ring and len(msgs) < LOG_DRAIN_BATCH:
+            ts, msg = ring.popleft()
+            msgs.append(f"[{format_ts(ts)}] {msg}")
+        if ring:
+            self.timer_log.start()
+        if msgs:
+            # Plain-text insert at the end: one edit, no rich-text detection
+            text = "\n".join(msgs)
+            if not self.txt_log.document().isEmpty():
+                text = "\n" + text
+            # Auto-scroll only if the view was already pinned to the bottom,
+            # so reading back through history isn't interrupted
+            scrollbar = self.txt_log.verticalScrollBar()
+            at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+            cursor = QTextCursor(self.txt_log.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(text)
+            if at_bottom:
                 scrollbar.setValue(scrollbar.maximum())
-            except Empty:
-                break
 
-    def _update_frames(self):
-        """Update preview with new frames"""
-        try:
-            while True:
-                client_key, image_bytes = self.server.frame_queue.get_nowait()
-                
-                # Only update if this is the selected client
-                if client_key == self.selected_preview_client:
-                    self._display_image_bytes(image_bytes)
-                    
-        except Empty:
-            pass
+    def _on_frame_ready(self, key):
+        """Update preview when the selected client's frame slot fills"""
+        # While a decode runs, newer frames wait in the slot and replace each other
+        if key != self.selected_preview_client or self._decoding:
+            return
+        
+        # Only the selected client's slot is consumed; others keep their newest frame
+        image_bytes = self.server.pop_latest_frame(key)
+        if image_bytes:
+            size = self.lbl_preview.size()
+            src = self._preview_src
+            if src and src[0] == key and src[1] is image_bytes and src[2] == size:
+                return  # already on screen at this size
+            self._preview_src = (key, image_bytes, size)
+            self._decoding = True
+            self.timer_preview_smooth.stop()
+            self.decode_pool.start(FrameDecoder(key, image_bytes, size, self.decode_signals))
+
+    def _on_frame_decoded(self, key, img, smooth):
+        """Show a decoded frame, then pick up whatever arrived meanwhile"""
+        self._decoding = False
+        if key == self.selected_preview_client:
+            if img.isNull():
+                self.lbl_preview.setText("Failed to load image")
+            else:
+                self.lbl_preview.setPixmap(QPixmap.fromImage(img))
+                if not smooth:
+                    self.timer_preview_smooth.start()
+        if self.selected_preview_client:
+            self._on_frame_ready(self.selected_preview_client)
+
+    def _smooth_preview(self):
+        """The stream went quiet: redraw the last frame with smooth scaling"""
+        src = self._preview_src
+        if self._decoding or not src or src[0] != self.selected_preview_client:
+            return
+        self._decoding = True
+        self.decode_pool.start(FrameDecoder(src[0], src[1], src[2], self.decode_signals, smooth=True))
 
     def _update_status(self):
         """Update status bar"""
-        if self.server.running.is_set():
-            stats = self.server.get_server_stats()
-            
-            # Uptime
-            hours, remainder = divmod(int(stats['uptime']), 3600)
-            minutes, seconds = divmod(remainder, 60)
-            self.lbl_uptime.setText(f"⏱️ Uptime: {hours:02d}:{minutes:02d}:{seconds:02d}")
-            
-            # Client count
-            self.lbl_clients_count.setText(f"👥 Clients: {stats['active_clients']}")
+        if self.server.running.is_set() and self.server.start_time:
+            # Uptime, redrawn only when the whole second moves
+            uptime = int(time.time() - self.server.start_time)
+            if uptime != self._last_uptime_s:
+                self._last_uptime_s = uptime
+                hours, remainder = divmod(uptime, 3600)
+                minutes, seconds = divmod(remainder, 60)
+                self.lbl_uptime.setText(f"⏱️ Uptime: {hours:02d}:{minutes:02d}:{seconds:02d}")
+
+    def _on_clients_changed(self, count):
+        """Client count, pushed by the server on connect/disconnect"""
+        if count != self._last_client_count:
+            self._last_client_count = count
+            self.lbl_clients_count.setText(f"👥 Clients: {count}")
+        self.refresh_clients()
 
     def start_server(self):
         """Start the server"""
@@ -1174,41 +1961,54 @@ class AdminWindow(QMainWindow):
 
     def refresh_clients(self):
         """Refresh client list"""
-        keys = self.server.list_clients()
-        selected = set([it.text().replace("💻 ", "") for it in self.lst_clients.selectedItems()])
-        
-        # Only update if the list has changed
-        current_keys = set([self.lst_clients.item(i).text().replace("💻 ", "") 
-                           for i in range(self.lst_clients.count())])
-        
-        if current_keys == set(keys):
-            # No change, don't refresh to avoid flickering
+        # Only update if a client came or went; avoids flickering
+        version = self.server.clients_version
+        if version == self._clients_version:
             return
+        self._clients_version = version
         
+        keys = self.server.list_clients()
+        selected = set(self._get_selected_keys())
+        # One batched insert, then attach the key and re-apply the selection by row
         self.lst_clients.clear()
-        for k in keys:
-            item = QListWidgetItem(f"💻 {k}")
+        self.lst_clients.addItems([f"💻 {k}" for k in keys])
+        for row, k in enumerate(keys):
+            item = self.lst_clients.item(row)
+            item.setData(Qt.UserRole, k)
             if k in selected:
                 item.setSelected(True)
-            self.lst_clients.addItem(item)
 
     def refresh_inbox(self):
         """Refresh inbox list"""
+        # Only rescan if files were added, removed or renamed since last time
         try:
-            files = sorted(os.listdir(INBOX_DIR), reverse=True)
-        except:
-            files = []
+            mtime = os.stat(INBOX_DIR).st_mtime_ns
+        except OSError:
+            mtime = 0
+        if mtime and mtime == self._inbox_mtime:
+            return
         
+        if self._inbox_scanning:
+            self._inbox_rescan = True
+            return
+        self._inbox_scanning = True
+        self._inbox_mtime = mtime
+        QThreadPool.globalInstance().start(InboxScanner(self.inbox_signals))
+
+    def _on_inbox_scanned(self, entries):
+        """Fill the inbox list from a finished scan"""
+        self._inbox_scanning = False
         self.lst_inbox.clear()
-        for fn in files:
-            path = os.path.join(INBOX_DIR, fn)
-            size = format_bytes(os.path.getsize(path))
-            item = QListWidgetItem(f"📄 {fn} ({size})")
-            self.lst_inbox.addItem(item)
+        self.lst_inbox.addItems([f"📄 {fn} ({format_bytes(size)})" for fn, size in entries])
+        for row, (fn, _) in enumerate(entries):
+            self.lst_inbox.item(row).setData(Qt.UserRole, fn)
+        if self._inbox_rescan:
+            self._inbox_rescan = False
+            self.refresh_inbox()
 
     def _get_selected_keys(self):
         """Get selected client keys"""
-        return [it.text().replace("💻 ", "") for it in self.lst_clients.selectedItems()]
+        return [it.data(Qt.UserRole) for it in self.lst_clients.selectedItems()]
 
     def send_to_selected(self, command):
         """Send command to selected clients only"""
@@ -1217,17 +2017,22 @@ class AdminWindow(QMainWindow):
             QMessageBox.warning(self, "No Selection", "Please select one or more clients")
             return
 
+        sent = self.server.send_command_to(keys, command)
+        self.log(f"📨 Sent '{command}' to {sent}/{len(keys)} selected clients")
+
+    def request_screenshot_selected(self):
+        """Request a saved screenshot from selected clients"""
+        keys = self._get_selected_keys()
+        if not keys:
+            QMessageBox.warning(self, "No Selection", "Please select one or more clients")
+            return
+
         sent = 0
-        with self.server.clients_lock:
-            for k in keys:
-                if k in self.server.clients:
-                    try:
-                        self.server.clients[k].client_socket.sendall((command + "\n").encode())
-                        sent += 1
-                    except Exception as e:
-                        self.log(f"❌ Failed to send '{command}' to {k}: {e}")
+        for handler in self.server.snapshot_clients(keys):
+            if handler.request_screenshot():
+                sent += 1
 
-        self.log(f"📨 Sent '{command}' to {sent}/{len(keys)} selected clients")
+        self.log(f"📸 Requested screenshot from {sent}/{len(keys)} selected clients")
 
     # Add this method to AdminWindow class in admin.py:
 
@@ -1275,16 +2080,14 @@ class AdminWindow(QMainWindow):
                 return
         
         # Send file to selected clients
-        with self.server.clients_lock:
-            sent = 0
-            for k in keys:
-                if k in self.server.clients:
-                    threading.Thread(
-                        target=self.server.clients[k].send_file,
-                        args=(path, destination),
-                        daemon=True
-                    ).start()
-                    sent += 1
+        sent = 0
+        for handler in self.server.snapshot_clients(keys):
+            threading.Thread(
+                target=handler.send_file,
+                args=(path, destination),
+                daemon=True
+            ).start()
+            sent += 1
         
         QMessageBox.information(
             self,
@@ -1336,14 +2139,12 @@ class AdminWindow(QMainWindow):
                 return
         
         # Send file to all clients
-        with self.server.clients_lock:
-            for k in keys:
-                if k in self.server.clients:
-                    threading.Thread(
-                        target=self.server.clients[k].send_file,
-                        args=(path, destination),
-                        daemon=True
-                    ).start()
+        for handler in self.server.snapshot_clients(keys):
+            threading.Thread(
+                target=handler.send_file,
+                args=(path, destination),
+                daemon=True
+            ).start()
         
         QMessageBox.information(
             self,
@@ -1366,10 +2167,8 @@ class AdminWindow(QMainWindow):
         )
         
         if ok and text:
-            with self.server.clients_lock:
-                for k in keys:
-                    if k in self.server.clients:
-                        self.server.clients[k].send_command(f"MESSAGE:{text}")
+            sent = self.server.send_command_to(keys, f"MESSAGE:{text}")
+            self.log(f"✉️ Sent message to {sent}/{len(keys)} selected clients")
 
     def broadcast_message(self):
         """Broadcast message to all clients"""
@@ -1385,6 +2184,7 @@ class AdminWindow(QMainWindow):
     def _on_client_selection_changed(self):
         """Handle client selection change"""
         keys = self._get_selected_keys()
+        self._preview_src = None  # label is about to change; force a fresh decode
         if keys:
             self.selected_preview_client = keys[0]
             self.lbl_preview_info.setText(f"Monitoring: {keys[0]}")
@@ -1404,45 +2204,23 @@ class AdminWindow(QMainWindow):
             handler = self.server.clients.get(self.selected_preview_client)
         
         if handler and handler.last_image:
-            self._display_image_bytes(handler.last_image)
+            # Decoded off-thread like a live frame; a newer pending one wins
+            self.server.offer_latest_frame(self.selected_preview_client, handler.last_image)
+            self._on_frame_ready(self.selected_preview_client)
         else:
             # Try to load latest from disk
             self._load_latest_frame_from_disk()
 
-    def _display_image_bytes(self, img_bytes: bytes):
-        """Display image from bytes"""
-        try:
-            qimg = QImage.fromData(QByteArray(img_bytes))
-            if not qimg.isNull():
-                pix = QPixmap.fromImage(qimg)
-                scaled_pix = pix.scaled(
-                    self.lbl_preview.size(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-                self.lbl_preview.setPixmap(scaled_pix)
-                return
-        except Exception as e:
-            self.server.log(f"❌ Error displaying image: {e}")
-        
-        self.lbl_preview.setText("Failed to load image")
-
     def _load_latest_frame_from_disk(self):
         """Load latest frame from disk for selected client"""
         if not self.selected_preview_client:
             return
         
         try:
-            prefix = self.selected_preview_client.replace(":", "_")
-            files = [
-                f for f in os.listdir(INBOX_DIR)
-                if f.startswith(prefix) and f.endswith(('.jpg', '.jpeg', '.png'))
-            ]
+            # Kept up to date by the server as screenshots are saved
+            latest = self.server.latest_frame_file.get(self.selected_preview_client)
             
-            if files:
-                files.sort(reverse=True)
-                latest = os.path.join(INBOX_DIR, files[0])
-                
+            if latest:
                 pix = QPixmap(latest)
                 if not pix.isNull():
                     scaled_pix = pix.scaled(
@@ -1477,21 +2255,14 @@ class AdminWindow(QMainWindow):
     def open_inbox_folder(self):
         """Open inbox folder in file explorer"""
         try:
-            path = os.path.realpath(INBOX_DIR)
-            if sys.platform.startswith("win"):
-                os.startfile(path)
-            elif sys.platform.startswith("darwin"):
-                os.system(f"open '{path}'")
-            else:
-                os.system(f"xdg-open '{path}'")
+            open_native(os.path.realpath(INBOX_DIR))
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Could not open folder: {e}")
 
     def open_inbox_file(self, item):
         """Open file from inbox"""
-        text = item.text()
-        # Remove emoji and size info
-        filename = text.replace("📄 ", "").split(" (")[0]
+        # The label also carries an emoji and the size; the name is kept as item data
+        filename = item.data(Qt.UserRole)
         path = os.path.join(INBOX_DIR, filename)
         
         if not os.path.exists(path):
@@ -1499,12 +2270,7 @@ class AdminWindow(QMainWindow):
             return
         
         try:
-            if sys.platform.startswith("win"):
-                os.startfile(path)
-            elif sys.platform.startswith("darwin"):
-                os.system(f"open '{path}'")
-            else:
-                os.system(f"xdg-open '{path}'")
+            open_native(path)
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Could not open file: {e}")
 
@@ -1517,23 +2283,21 @@ class AdminWindow(QMainWindow):
             QMessageBox.Yes | QMessageBox.No
         )
         
-        if reply == QMessageBox.Yes:
-            try:
-                count = 0
-                for filename in os.listdir(INBOX_DIR):
-                    filepath = os.path.join(INBOX_DIR, filename)
-                    try:
-                        if os.path.isfile(filepath):
-                            os.remove(filepath)
-                            count += 1
-                    except:
-                        pass
-                
-                self.refresh_inbox()
-                QMessageBox.information(self, "Cleared", f"Deleted {count} file(s)")
-                self.server.log(f"🗑️ Cleared inbox: {count} files deleted")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Failed to clear inbox: {e}")
+        if reply == QMessageBox.Yes and not self._inbox_clearing:
+            # Deleting thousands of files would stall painting; do it off-thread
+            self._inbox_clearing = True
+            self.server.latest_frame_file.clear()
+            QThreadPool.globalInstance().start(InboxCleaner(self.inbox_signals))
+
+    def _on_inbox_cleared(self, count):
+        """Report a finished clear_inbox"""
+        self._inbox_clearing = False
+        self.refresh_inbox()
+        if count < 0:
+            QMessageBox.warning(self, "Error", "Failed to clear inbox")
+            return
+        QMessageBox.information(self, "Cleared", f"Deleted {count} file(s)")
+        self.server.log(f"🗑️ Cleared inbox: {count} files deleted")
 
     def save_log(self):
         """Save log to file"""
@@ -4,31 +4,199 @@ import socket
 import threading
 import struct
 import time
-import io
 import json
-import mss
-import cv2
-import numpy as np
-from datetime import datetime
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout, 
-                             QPushButton, QMessageBox, QTextEdit, QProgressBar,
+                             QPushButton, QMessageBox, QPlainTextEdit, QProgressBar,
                              QHBoxLayout, QSystemTrayIcon, QMenu, QAction, QInputDialog)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject
+from PyQt5.QtCore import Qt, QTimer, QEvent, pyqtSignal, QObject
 from PyQt5.QtGui import QPixmap, QIcon, QFont, QColor, QPalette
-from PIL import ImageGrab
+# mss, cv2 and numpy are imported on first capture: most sessions never
+# take a screenshot, and they are the bulk of startup time and memory
 
 # ==============================
 # Configuration
 # ==============================
 SERVER_HOST = '192.168.68.103'  # Change this to admin/teacher IP
 SERVER_PORT = 5001
-BUFFER_SIZE = 65536
+CMD_RECV_SIZE = 4096  # command lines and file metadata are small
+BULK_RECV_SIZE = 256 * 1024  # legacy <END>-terminated file bodies
+SOCKET_BUFFER = 4 * 1024 * 1024  # SO_SNDBUF / SO_RCVBUF; only two sockets, so this can be generous
+LOG_RING_SIZE = 2000  # pending log lines; the oldest are dropped in a flood
+LOG_VIEW_MAX_LINES = 2000  # older lines are dropped from the log view
+LOG_REPEAT_FLUSH = 30  # seconds; a run of repeated log lines is summarised at most this often
+PROGRESS_INTERVAL = 0.1  # seconds between file progress updates
+PROGRESS_DRAW_MS = 80  # GUI redraw limit for the file progress bar
+HEARTBEAT_INTERVAL = 10  # seconds; skipped while frames are going out anyway
 RECONNECT_DELAY = 5000  # milliseconds
 SCREENSHOT_QUALITY = 85  # JPEG quality (1-100)
 STREAM_FPS = 10  # Frames per second for streaming
 # Constants (you can adjust)
 SCREENSHOT_QUALITY = 60      # JPEG quality
 SCREEN_SHARE_INTERVAL = 0.03  # seconds per frame (≈ 30 FPS)
+STREAM_MAX_WIDTH = 1280  # stream frames wider than this are scaled down before encoding
+
+# Precompiled wire-format size fields
+_U64_BE = struct.Struct(">Q")  # frame / file body length
+_U32_BE = struct.Struct(">I")  # SEND_FILE metadata length
+FRAME_HEADER = b"FRAME\n"
+
+# socket.sendmsg is missing on Windows; frames are joined into one send there
+# unless the payload is big enough that copying it costs more than a second send
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+JOIN_MAX = 64 * 1024
+
+FILE_STAGE_SIZE = 1 << 20  # reusable recv_into buffer for file bodies
+_STAGE = threading.local()  # per-thread reusable buffers and capture handles
+
+
+_ts_cache = [None, ""]  # (second, formatted) of the last log_ts() call
+
+
+def log_ts():
+    """HH:MM:SS for log lines; each second is formatted once"""
+    sec = int(time.time())
+    if _ts_cache[0] != sec:
+        _ts_cache[0], _ts_cache[1] = sec, time.strftime("%H:%M:%S", time.localtime(sec))
+    return _ts_cache[1]
+
+
+def _stage_buffer():
+    """Per-thread 1 MiB staging view, allocated once"""
+    mv = getattr(_STAGE, "mv", None)
+    if mv is None:
+        mv = _STAGE.mv = memoryview(bytearray(FILE_STAGE_SIZE))
+    return mv
+
+
+def write_all(f, data):
+    """Write every byte to an unbuffered file, which may take several write() calls"""
+    mv = memoryview(data)
+    while mv:
+        mv = mv[f.write(mv):]
+
+
+def recv_append(sock, buffer, size):
+    """recv() onto the end of a bytearray through the staging buffer, so no
+    bytes object is created per call; returns the byte count, 0 at EOF"""
+    stage = _stage_buffer()
+    n = sock.recv_into(stage[:size])
+    buffer += stage[:n]
+    return n
+
+
+def _screen_grabber():
+    """Per-thread mss instance, so repeated one-off screenshots reuse it"""
+    sct = getattr(_STAGE, "sct", None)
+    if sct is None:
+        import mss
+        sct = _STAGE.sct = mss.mss()
+    return sct
+
+
+_simplejpeg = None  # the module once imported, False if it isn't installed
+
+
+def tune_socket(sock):
+    """Low-latency, large-buffer settings; call before connect() so the
+    receive window is negotiated with the bigger buffer"""
+    for level, opt, value in (
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER),
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER),
+    ):
+        try:
+            sock.setsockopt(level, opt, value)
+        except OSError:
+            pass
+
+
+class _LatestFrame:
+    """One-frame hand-off between two threads; put() replaces an untaken frame"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self.closed = False
+
+    def put(self, item):
+        """Offer a frame; returns the one it replaced, if any"""
+        with self._cond:
+            dropped, self._item = self._item, item
+            self._cond.notify()
+        return dropped
+
+    def take(self):
+        """Wait for the next frame; None once closed"""
+        with self._cond:
+            while self._item is None and not self.closed:
+                self._cond.wait()
+            item, self._item = self._item, None
+        return None if self.closed else item
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+def sendall_parts(sock, parts):
+    """sendall() of several buffers, gathered by sendmsg so they aren't joined first"""
+    if not _HAS_SENDMSG:
+        *head, body = parts
+        if len(body) < JOIN_MAX:
+            sock.sendall(b"".join(parts))
+        else:
+            sock.sendall(b"".join(head))
+            sock.sendall(body)
+        return
+    views = [memoryview(p) for p in parts]
+    while views:
+        sent = sock.sendmsg(views)
+        while views and sent >= len(views[0]):
+            sent -= len(views.pop(0))
+        if sent:
+            views[0] = views[0][sent:]
+
+
+def simplejpeg_module():
+    """simplejpeg (libjpeg-turbo, SIMD) if available; it is optional"""
+    global _simplejpeg
+    if _simplejpeg is None:
+        try:
+            import simplejpeg
+            _simplejpeg = simplejpeg
+        except ImportError:
+            _simplejpeg = False
+    return _simplejpeg
+
+
+def grab_jpeg(sct, quality):
+    """Primary monitor as JPEG bytes
+
+    `sct` is an mss instance kept by the caller for as long as it captures;
+    it owns the capture buffers, and must stay on the thread that made it.
+    """
+    return encode_shot(sct.grab(sct.monitors[1]), quality)
+
+
+def encode_shot(shot, quality):
+    """An mss screenshot as JPEG bytes"""
+    import numpy as np
+    bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+    sj = simplejpeg_module()
+    if sj:
+        # mss hands back BGRA, which simplejpeg encodes without a conversion pass
+        return sj.encode_jpeg(bgra, quality=quality, colorspace="BGRA")
+    # OpenCV's libjpeg-turbo, a single Huffman pass unlike Pillow's optimize=True;
+    # its JPEG writer drops the alpha channel itself
+    import cv2
+    ok, buffer = cv2.imencode('.jpg', bgra, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return buffer.tobytes()
 
 
 
@@ -70,15 +238,11 @@ class LockOverlay(QWidget):
         self.grabMouse()
         
     def keyPressEvent(self, event):
+        # Every key is swallowed; U asks for the admin code
         if event.key() == Qt.Key_U:
-                code, ok = QInputDialog.getText(self, "Unlock", "Enter admin code:")
-        if ok and code == "admin123":  # Replace with your admin code
-            self.close()
-        else:
-            pass
-
-    def keyPressEvent(self, event):
-        pass  # ignore all keys
+            code, ok = QInputDialog.getText(self, "Unlock", "Enter admin code:")
+            if ok and code == "admin123":  # Replace with your admin code
+                self.close()
 
     def mousePressEvent(self, event):
         pass  # ignore clicks
@@ -97,7 +261,7 @@ class SignalHandler(QObject):
     update_status = pyqtSignal(str, str)  # (message, color)
     show_message = pyqtSignal(str, str)  # (title, message)
     file_progress = pyqtSignal(int, str)  # (percentage, status)
-    log_message = pyqtSignal(str)  # log entry
+    log_added = pyqtSignal()  # log_ring got lines while no drain was pending
 
 # ==============================
 # Improved Student Client GUI
@@ -130,7 +294,7 @@ class StudentClient(QWidget):
             QLabel {
                 padding: 5px;
             }
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1e1e1e;
                 border: 1px solid #444;
                 border-radius: 4px;
@@ -148,19 +312,59 @@ class StudentClient(QWidget):
         
         # Initialize variables
         self.client_socket = None
+        self.bulk_socket = None  # second connection for file pushes
+        self.send_lock = threading.Lock()  # frames and heartbeats share client_socket
+        self.last_send = 0.0  # time.monotonic() of the last frame or heartbeat sent
+        # Reused for every server command instead of a new thread per line
+        self.command_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cmd")
+        # Server commands: whole-line commands, then "NAME:argument" ones
+        self.commands = {
+            "LOCK": self.lock_screen,
+            "UNLOCK": self.unlock_screen,
+            "REQUEST_SCREEN": self.send_screen_once,  # already on a command pool worker
+            "START_SCREEN_STREAM": self.start_streaming_screen,
+            "STOP_SCREEN_STREAM": self.stop_streaming_screen,
+        }
+        self.arg_commands = {
+            "MESSAGE": lambda msg: self.signals.show_message.emit("Message from Admin", msg),
+            "CLIENT_ID": self.open_bulk_channel,
+        }
+        # Destination keywords, resolved once rather than on every file received
+        home = os.path.expanduser("~")
+        self.dest_map = {
+            name.lower(): os.path.abspath(os.path.join(home, name))
+            for name in ("Downloads", "Desktop", "Documents")
+        }
         self.connected = False
         self.screen_sharing = False
         self.locked = False
         self.running = True
         self.reconnect_timer = None
         self.heartbeat_timer = None
+        self.log_ring = deque(maxlen=LOG_RING_SIZE)  # append/popleft are thread-safe
+        self.log_signalled = False
+        self.log_lock = threading.Lock()  # fold state below, and log_signalled
+        self.last_log_message = None  # consecutive repeats are counted, not logged
+        self.log_repeats = 0
+        self.repeat_since = 0.0  # time.monotonic() of the first repeat not yet shown
+        self.connect_failures = 0  # reconnect attempts since the last success
         
         # Signal handler for thread-safe updates
         self.signals = SignalHandler()
         self.signals.update_status.connect(self.update_status_label)
         self.signals.show_message.connect(self.display_message)
-        self.signals.file_progress.connect(self.update_file_progress)
-        self.signals.log_message.connect(self.append_log)
+        self.signals.file_progress.connect(self._queue_file_progress)
+        # Progress is drawn at most every PROGRESS_DRAW_MS; only the latest value counts
+        self._pending_progress = None
+        self.timer_progress = QTimer(self)
+        self.timer_progress.setSingleShot(True)
+        self.timer_progress.setInterval(PROGRESS_DRAW_MS)
+        self.timer_progress.timeout.connect(self._flush_file_progress)
+        # Shows a pending repeat count even when nothing else gets logged after it
+        self.timer_repeats = QTimer(self)
+        self.timer_repeats.setSingleShot(True)
+        self.timer_repeats.timeout.connect(self.append_log)
+        self.signals.log_added.connect(self.append_log)
         
         self.setup_ui()
         self.setup_system_tray()
@@ -228,9 +432,11 @@ class StudentClient(QWidget):
         log_label.setFont(QFont("Segoe UI", 11, QFont.Bold))
         main_layout.addWidget(log_label)
         
-        self.log_text = QTextEdit()
+        # Plain text: no rich-text layout per line, and old lines drop off cheaply
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
         self.log_text.setMaximumHeight(200)
+        self.log_text.setMaximumBlockCount(LOG_VIEW_MAX_LINES)
         main_layout.addWidget(self.log_text)
         
         # Footer
@@ -271,15 +477,57 @@ class StudentClient(QWidget):
 
     def log(self, message):
         """Add message to log"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.signals.log_message.emit(f"[{timestamp}] {message}")
-
-    def append_log(self, message):
-        """Append to log (thread-safe)"""
-        self.log_text.append(message)
-        # Auto-scroll to bottom
-        scrollbar = self.log_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        # Bounded ring with one pending signal, so a flood of log calls from
+        # worker threads can't pile up events or memory
+        with self.log_lock:
+            if message == self.last_log_message:
+                if not self.log_repeats:
+                    self.repeat_since = time.monotonic()
+                self.log_repeats += 1
+            else:
+                timestamp = log_ts()
+                if self.log_repeats:
+                    self.log_ring.append(f"[{timestamp}] (last message repeated {self.log_repeats} times)")
+                    self.log_repeats = 0
+                self.last_log_message = message
+                self.log_ring.append(f"[{timestamp}] {message}")
+            signal = not self.log_signalled
+            self.log_signalled = True
+        if signal:
+            self.signals.log_added.emit()
+
+    def append_log(self):
+        """Drain log_ring into the log view (GUI thread)
+
+        Nothing is laid out while the window is hidden to the tray or
+        minimized: lines wait in the ring, log_signalled stays set so no
+        further signals are sent, and showing the window drains it.
+
+        A pending repeat count is written out ahead of newer lines, or once
+        LOG_REPEAT_FLUSH has passed since its first repeat; until then
+        timer_repeats comes back for it, so a run that ends is still shown.
+        """
+        if not self.isVisible() or self.isMinimized():
+            return
+        ring = self.log_ring
+        with self.log_lock:
+            self.log_signalled = False
+            wait = 0
+            if self.log_repeats:
+                wait = self.repeat_since + LOG_REPEAT_FLUSH - time.monotonic()
+                if ring or wait <= 0:
+                    ring.append(f"[{log_ts()}] (last message repeated {self.log_repeats} times)")
+                    self.log_repeats = 0
+                    wait = 0
+        if wait > 0 and not self.timer_repeats.isActive():
+            self.timer_repeats.start(int(wait * 1000) + 1)
+        lines = []
+        while ring:
+            lines.append(ring.popleft())
+        if not lines:
+            return
+        # Keeps following the end when the view is already at the bottom
+        self.log_text.appendPlainText("\n".join(lines))
 
     def update_status_label(self, message, color):
         """Update status label (thread-safe)"""
@@ -298,15 +546,22 @@ class StudentClient(QWidget):
         if self.connected or not self.running:
             return
         
-        self.log("Attempting to connect to server...")
+        # While the server stays down only the failure line repeats, so the
+        # log folds the whole outage into one line and a repeat count
+        if not self.connect_failures:
+            self.log("Attempting to connect to server...")
         self.signals.update_status.emit("🔄 Connecting to server...", "")
         
         try:
             self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            tune_socket(self.client_socket)
             self.client_socket.settimeout(10)
             self.client_socket.connect((SERVER_HOST, SERVER_PORT))
             self.client_socket.settimeout(None)
+            # The server lists a connection once its first line shows it isn't a bulk channel
+            self.client_socket.sendall(b"HELLO\n")
             self.connected = True
+            self.connect_failures = 0
             
             self.signals.update_status.emit("✅ Connected to Admin/Teacher Server", "green")
             self.log("Successfully connected to server")
@@ -323,10 +578,12 @@ class StudentClient(QWidget):
             self.signals.update_status.emit(f"❌ Connection failed: {str(e)}", "red")
             self.log(f"Connection failed: {e}")
             self.reconnect_button.setEnabled(True)
+            self.connect_failures += 1
             
             # Schedule reconnection
             if self.running:
-                self.log(f"Retrying in {RECONNECT_DELAY//1000} seconds...")
+                if self.connect_failures == 1:
+                    self.log(f"Retrying every {RECONNECT_DELAY//1000} seconds...")
                 QTimer.singleShot(RECONNECT_DELAY, self.attempt_connection)
 
     def manual_reconnect(self):
@@ -340,19 +597,28 @@ class StudentClient(QWidget):
         self.connected = False
         self.screen_sharing = False
         self.stop_heartbeat()
-        if self.client_socket:
-            try:
-                self.client_socket.close()
-            except:
-                pass
-            self.client_socket = None
+        # shutdown() first so threads blocked in recv() return right away
+        for sock in (self.bulk_socket, self.client_socket):
+            if sock:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except:
+                    pass
+                try:
+                    sock.close()
+                except:
+                    pass
+        self.bulk_socket = None
+        self.client_socket = None
 
     def start_heartbeat(self):
         """Start sending heartbeat to keep connection alive"""
         self.stop_heartbeat()
         self.heartbeat_timer = QTimer()
+        # Whole-second accuracy is plenty, and lets Qt batch the wakeup with others
+        self.heartbeat_timer.setTimerType(Qt.VeryCoarseTimer)
         self.heartbeat_timer.timeout.connect(self.send_heartbeat)
-        self.heartbeat_timer.start(10000)  # Every 10 seconds
+        self.heartbeat_timer.start(HEARTBEAT_INTERVAL * 1000)
 
     def stop_heartbeat(self):
         """Stop heartbeat timer"""
@@ -362,9 +628,14 @@ class StudentClient(QWidget):
 
     def send_heartbeat(self):
         """Send heartbeat to server"""
+        # Any frame sent recently already shows the server we're alive
+        if time.monotonic() - self.last_send < HEARTBEAT_INTERVAL - 1:
+            return
         if self.connected and self.client_socket:
             try:
-                self.client_socket.sendall(b"HEARTBEAT\n")
+                with self.send_lock:
+                    self.client_socket.sendall(b"HEARTBEAT\n")
+                    self.last_send = time.monotonic()
             except:
                 # Connection lost
                 self.disconnect_socket()
@@ -372,6 +643,12 @@ class StudentClient(QWidget):
                 if self.running:
                     QTimer.singleShot(RECONNECT_DELAY, self.attempt_connection)
 
+    def send_frame(self, data):
+        """Send one JPEG as "FRAME\\n" + 8-byte size + data"""
+        with self.send_lock:
+            sendall_parts(self.client_socket, (FRAME_HEADER, _U64_BE.pack(len(data)), data))
+            self.last_send = time.monotonic()
+
     # def listen_for_commands(self):
     #     """Listen for commands from server"""
     #     self.sock.settimeout(1.0)  # Set timeout for recv
@@ -422,23 +699,14 @@ class StudentClient(QWidget):
     def process_command(self, command):
         """Process received command"""
         print(f"[DEBUG] Received command: '{command}'")
-        if command == "LOCK":
-            print("[DEBUG] Lock command received, locking now.")
-            self.lock_screen()
-        elif command == "UNLOCK":
-            self.unlock_screen()
-        elif command == "REQUEST_SCREEN":
-            threading.Thread(target=self.send_screen_once, daemon=True).start()
-        elif command == "START_SCREEN_STREAM":
-            self.start_streaming_screen()
-        elif command == "STOP_SCREEN_STREAM":
-            self.stop_streaming_screen()
-        elif command.startswith("MESSAGE:"):
-            msg = command[8:]  # Remove "MESSAGE:" prefix
-            self.signals.show_message.emit("Message from Admin", msg)
-        elif command.startswith("SEND_FILE:"):
-            filename = command.split(":", 1)[1]
-            threading.Thread(target=self.receive_file, args=(filename,), daemon=True).start()
+        handler = self.commands.get(command)
+        if handler is not None:
+            handler()
+            return
+        name, sep, arg = command.partition(":")
+        handler = self.arg_commands.get(name) if sep else None
+        if handler is not None:
+            handler(arg)
 
     def lock_screen(self):
         """Lock the student's screen"""
@@ -467,100 +735,28 @@ class StudentClient(QWidget):
         QMessageBox.information(self, title, message)
         self.log(f"Message displayed: {message}")
 
-    def receive_file(self, filename):
-        """Receive file from server with destination support"""
-        try:
-            # Read metadata first
-            meta_len_bytes = self.client_socket.recv(4)
-            if len(meta_len_bytes) < 4:
-                self.log("Error: Could not read metadata length")
-                return
-            
-            meta_len = struct.unpack(">I", meta_len_bytes)[0]
-            meta_json = b""
-            
-            while len(meta_json) < meta_len:
-                chunk = self.client_socket.recv(meta_len - len(meta_json))
-                if not chunk:
-                    self.log("Error: Connection closed while reading metadata")
-                    return
-                meta_json += chunk
-            
-            # Parse metadata
-            try:
-                metadata = json.loads(meta_json.decode('utf-8'))
-                destination = metadata.get("destination", "Downloads")
-                safe_filename = os.path.basename(metadata.get("filename", filename))
-            except:
-                destination = "Downloads"
-                safe_filename = os.path.basename(filename)
-            
-            self.signals.file_progress.emit(0, f"Receiving: {safe_filename}")
-            self.log(f"Starting file transfer: {safe_filename} -> {destination}")
-            
-            # Resolve destination path
-            filepath = self._resolve_destination_path(destination, safe_filename)
-            
-            if not filepath:
-                self.log(f"Error: Invalid destination path: {destination}")
-                self.signals.file_progress.emit(0, "Error: Invalid destination")
-                return
-            
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            # Receive file data
-            total_received = 0
-            with open(filepath, 'wb') as f:
-                while True:
-                    chunk = self.client_socket.recv(BUFFER_SIZE)
-                    if not chunk:
-                        break
-                    
-                    # Check for terminator
-                    if b"<END>" in chunk:
-                        end_pos = chunk.find(b"<END>")
-                        if end_pos > 0:
-                            f.write(chunk[:end_pos])
-                            total_received += end_pos
-                        break
-                    
-                    f.write(chunk)
-                    total_received += len(chunk)
-                    
-                    # Update progress
-                    if total_received % (BUFFER_SIZE * 10) == 0:
-                        self.signals.file_progress.emit(50, f"Receiving: {total_received//1024} KB")
-            
-            self.signals.file_progress.emit(100, f"Completed: {safe_filename}")
-            self.log(f"File received successfully: {filepath}")
-            self.signals.show_message.emit("File Received", 
-                                        f"File '{safe_filename}' saved to:\n{filepath}")
-            
-            # Hide progress after 3 seconds
-            QTimer.singleShot(3000, lambda: self.signals.file_progress.emit(0, ""))
-            
-        except Exception as e:
-            self.log(f"File receive error: {e}")
-            self.signals.file_progress.emit(0, f"Error: {str(e)}")
-            
     def listen_for_commands(self):
-        """Listen for commands and files from server"""
-        self.client_socket.settimeout(1.0)
-        buffer = b""
+        """Listen for commands and files from server
+
+        The socket stays blocking; disconnect_socket() shuts it down, which
+        wakes the recv() below.
+        """
+        buffer = bytearray()  # grows in place; consumed lines are cut off once per recv
         
         while self.connected and self.running:
             try:
-                data = self.client_socket.recv(BUFFER_SIZE)
-                if not data:
+                if not recv_append(self.client_socket, buffer, CMD_RECV_SIZE):
                     self.log("Server closed connection")
                     break
                 
-                buffer += data
-                
                 # Process complete commands/headers (ending with newline)
-                while b'\n' in buffer:
-                    line, buffer = buffer.split(b'\n', 1)
+                start = 0
+                while True:
+                    nl = buffer.find(b'\n', start)
+                    if nl < 0:
+                        break
+                    line = buffer[start:nl]
+                    start = nl + 1
                     command = line.decode('utf-8', errors='ignore').strip()
                     
                     if not command:
@@ -568,21 +764,19 @@ class StudentClient(QWidget):
                     
                     self.log(f"Received command: {command}")
                     
-                    # Check if this is a file transfer
-                    if command.upper() == "SEND_FILE":
-                        # File transfer incoming - handle in this thread
-                        self._receive_file_from_socket(buffer)
-                        buffer = b""  # Reset buffer after file transfer
+                    # Check if this is a file transfer ("SEND_FILE" or "SEND_FILE:<name>")
+                    name, sep, arg = command.partition(":")
+                    if name.upper() == "SEND_FILE":
+                        # File transfer incoming - handle in this thread, which owns
+                        # the socket, and carry on with whatever follows the body
+                        buffer = self._receive_file_from_socket(
+                            buffer[start:], default_name=arg if sep and arg else "file")
+                        start = 0
                     else:
-                        # Regular command - process in separate thread
-                        threading.Thread(
-                            target=self.process_command,
-                            args=(command,),
-                            daemon=True
-                        ).start()
+                        # Regular command - process on the command pool
+                        self.command_pool.submit(self.process_command, command)
+                del buffer[:start]
                     
-            except socket.timeout:
-                continue
             except Exception as e:
                 self.log(f"Listen error: {e}")
                 break
@@ -597,42 +791,93 @@ class StudentClient(QWidget):
             QTimer.singleShot(RECONNECT_DELAY, self.attempt_connection)
 
 
-    def _receive_file_from_socket(self, initial_buffer):
-        """Receive file directly from socket with metadata"""
+    def open_bulk_channel(self, client_id):
+        """Open the second connection the server pushes files over"""
         try:
-            buffer = initial_buffer
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            tune_socket(sock)
+            sock.settimeout(10)
+            sock.connect((SERVER_HOST, SERVER_PORT))
+            sock.settimeout(None)
+            sock.sendall(f"BULK:{client_id}\n".encode())
+        except Exception as e:
+            # Files still arrive on the command connection
+            self.log(f"Bulk channel unavailable: {e}")
+            return
+        self.bulk_socket = sock
+        self.log("Bulk channel connected")
+        threading.Thread(target=self.listen_for_files, args=(sock,), daemon=True).start()
+
+    def listen_for_files(self, sock):
+        """Receive files pushed over the bulk channel"""
+        buffer = bytearray()
+        while self.connected and self.running and sock is self.bulk_socket:
+            try:
+                if not recv_append(sock, buffer, CMD_RECV_SIZE):
+                    break
+                start = 0
+                while True:
+                    nl = buffer.find(b'\n', start)
+                    if nl < 0:
+                        break
+                    line = buffer[start:nl]
+                    start = nl + 1
+                    if line.strip().upper() == b"SEND_FILE":
+                        buffer = self._receive_file_from_socket(buffer[start:], sock)
+                        start = 0
+                del buffer[:start]
+            except Exception as e:
+                if sock is self.bulk_socket:
+                    self.log(f"Bulk channel error: {e}")
+                break
+        if sock is self.bulk_socket:
+            self.bulk_socket = None
+            try:
+                sock.close()
+            except:
+                pass
+            self.log("Bulk channel closed")
+
+    def _receive_file_from_socket(self, initial_buffer, sock=None, default_name="file"):
+        """Receive file directly from socket with metadata
+
+        Returns whatever was read past the end of the file, as a bytearray
+        (empty on error). A file cut short by the peer closing is removed,
+        not reported as received.
+        """
+        sock = sock or self.client_socket
+        filepath = None
+        try:
+            buffer = bytearray(initial_buffer)
             
             # Read metadata length (4 bytes)
             while len(buffer) < 4:
-                chunk = self.client_socket.recv(BUFFER_SIZE)
-                if not chunk:
+                if not recv_append(sock, buffer, CMD_RECV_SIZE):
                     self.log("Error: Connection closed while reading metadata length")
-                    return
-                buffer += chunk
+                    return bytearray()
             
-            meta_len = struct.unpack(">I", buffer[:4])[0]
-            buffer = buffer[4:]
+            meta_len = _U32_BE.unpack_from(buffer)[0]
+            del buffer[:4]
             
             # Read metadata JSON
             while len(buffer) < meta_len:
-                chunk = self.client_socket.recv(BUFFER_SIZE)
-                if not chunk:
+                if not recv_append(sock, buffer, CMD_RECV_SIZE):
                     self.log("Error: Connection closed while reading metadata")
-                    return
-                buffer += chunk
+                    return bytearray()
             
             meta_json = buffer[:meta_len]
-            buffer = buffer[meta_len:]
+            del buffer[:meta_len]
             
             # Parse metadata
+            metadata = {}
             try:
                 metadata = json.loads(meta_json.decode('utf-8'))
                 destination = metadata.get("destination", "Downloads")
-                safe_filename = os.path.basename(metadata.get("filename", "file"))
+                safe_filename = os.path.basename(metadata.get("filename", default_name))
             except Exception as e:
                 self.log(f"Error parsing metadata: {e}")
                 destination = "Downloads"
-                safe_filename = "file"
+                safe_filename = os.path.basename(default_name)
             
             self.signals.file_progress.emit(0, f"Receiving: {safe_filename}")
             self.log(f"Starting file transfer: {safe_filename} -> {destination}")
@@ -643,41 +888,83 @@ class StudentClient(QWidget):
             if not filepath:
                 self.log(f"Error: Invalid destination path: {destination}")
                 self.signals.file_progress.emit(0, "Error: Invalid destination")
-                return
+                return bytearray()
             
             # Ensure directory exists
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
             
             # Receive file data
             total_received = 0
-            with open(filepath, 'wb') as f:
-                while True:
-                    # Need at least some data
-                    if len(buffer) == 0:
-                        chunk = self.client_socket.recv(BUFFER_SIZE)
-                        if not chunk:
+            expected = metadata.get("size")  # announced by newer servers
+            last_emit = 0.0  # progress goes to the GUI at most every PROGRESS_INTERVAL
+            complete = False  # set once the whole body (or its "<END>") has arrived
+            # Unbuffered: chunks go from the staging view to the OS in one copy
+            with open(filepath, 'wb', buffering=0) as f:
+                if expected is not None:
+                    # Exact-size body: no scanning, and "<END>" inside the file is harmless
+                    head = buffer[:expected]
+                    write_all(f, head)
+                    total_received = len(head)
+                    del buffer[:len(head)]
+                    last_pct = -1
+                    stage = _stage_buffer()
+                    while total_received < expected:
+                        n = sock.recv_into(stage[:min(FILE_STAGE_SIZE, expected - total_received)])
+                        if not n:
                             self.log("Error: Connection closed during file transfer")
                             break
-                        buffer += chunk
+                        write_all(f, stage[:n])
+                        total_received += n
+                        # Only a new whole percent is worth a signal, and at most
+                        # one per PROGRESS_INTERVAL
+                        pct = total_received * 100 // expected
+                        now = time.monotonic()
+                        if pct != last_pct and now - last_emit >= PROGRESS_INTERVAL:
+                            last_pct = pct
+                            last_emit = now
+                            self.signals.file_progress.emit(pct, f"Receiving: {total_received//1024} KB")
+                    complete = total_received == expected
                     
+                    # Trailer kept for older clients
+                    while total_received == expected and len(buffer) < 5:
+                        if not recv_append(sock, buffer, 5 - len(buffer)):
+                            break
+                    if buffer.startswith(b"<END>"):
+                        del buffer[:5]
+                
+                while expected is None:
                     # Check for terminator
-                    if b"<END>" in buffer:
-                        end_pos = buffer.find(b"<END>")
-                        if end_pos > 0:
-                            f.write(buffer[:end_pos])
-                            total_received += end_pos
-                        buffer = buffer[end_pos + 5:]  # Skip past <END>
+                    end_pos = buffer.find(b"<END>")
+                    if end_pos >= 0:
+                        write_all(f, buffer[:end_pos])
+                        total_received += end_pos
+                        del buffer[:end_pos + 5]  # Skip past <END>
+                        complete = True
                         break
                     
-                    # Write chunk
-                    to_write = len(buffer)
-                    f.write(buffer)
-                    total_received += to_write
-                    buffer = b""
+                    # Write all but the last 4 bytes, which may start a "<END>"
+                    # split across two recvs
+                    to_write = len(buffer) - min(4, len(buffer))
+                    if to_write:
+                        write_all(f, buffer[:to_write])
+                        total_received += to_write
+                        del buffer[:to_write]
                     
-                    # Update progress
-                    if total_received % (BUFFER_SIZE * 5) == 0:
+                    # Update progress; the size is unknown, so show a half-way bar
+                    now = time.monotonic()
+                    if to_write and now - last_emit >= PROGRESS_INTERVAL:
+                        last_emit = now
                         self.signals.file_progress.emit(50, f"Receiving: {total_received//1024} KB")
+                    
+                    if not recv_append(sock, buffer, BULK_RECV_SIZE):
+                        self.log("Error: Connection closed during file transfer")
+                        break
+            
+            if not complete:
+                # Short read: the peer is gone and the file is truncated
+                self._remove_partial_file(filepath)
+                self.signals.file_progress.emit(0, f"Error: {safe_filename} incomplete")
+                return bytearray()
             
             self.signals.file_progress.emit(100, f"Completed: {safe_filename}")
             self.log(f"File received successfully: {filepath} ({total_received} bytes)")
@@ -686,32 +973,36 @@ class StudentClient(QWidget):
             
             # Hide progress after 3 seconds
             QTimer.singleShot(3000, lambda: self.signals.file_progress.emit(0, ""))
+            return buffer
             
         except Exception as e:
             self.log(f"File receive error: {e}")
             import traceback
             self.log(f"Traceback: {traceback.format_exc()}")
             self.signals.file_progress.emit(0, f"Error: {str(e)}")
+            self._remove_partial_file(filepath)
+            return bytearray()
+
+    def _remove_partial_file(self, filepath):
+        """Delete a file whose transfer didn't finish"""
+        if not filepath:
+            return
+        try:
+            os.remove(filepath)
+            self.log(f"Removed incomplete file: {filepath}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.log(f"Could not remove incomplete file {filepath}: {e}")
 
 
     def _resolve_destination_path(self, destination, filename):
         """Resolve destination path, handling special keywords and custom paths"""
         try:
-            home = os.path.expanduser("~")
-            
-            # Handle common destinations
-            if destination.lower() == "downloads":
-                base_path = os.path.join(home, "Downloads")
-            elif destination.lower() == "desktop":
-                base_path = os.path.join(home, "Desktop")
-            elif destination.lower() == "documents":
-                base_path = os.path.join(home, "Documents")
-            else:
-                # Treat as custom path
-                base_path = destination
-            
-            # Validate and make absolute path
-            base_path = os.path.abspath(base_path)
+            # Handle common destinations; anything else is a custom path
+            base_path = self.dest_map.get(destination.lower())
+            if base_path is None:
+                base_path = os.path.abspath(destination)
             
             filepath = os.path.join(base_path, filename)
             filepath = os.path.abspath(filepath)
@@ -731,6 +1022,17 @@ class StudentClient(QWidget):
             self.log(f"Error resolving destination path: {e}")
             return None
 
+    def _queue_file_progress(self, percentage, status):
+        """Keep the newest progress value; the timer draws it"""
+        self._pending_progress = (percentage, status)
+        if not self.timer_progress.isActive():
+            self.timer_progress.start()
+
+    def _flush_file_progress(self):
+        pending, self._pending_progress = self._pending_progress, None
+        if pending:
+            self.update_file_progress(*pending)
+
     def update_file_progress(self, percentage, status):
         """Update file transfer progress (thread-safe)"""
         if percentage > 0:
@@ -749,18 +1051,9 @@ class StudentClient(QWidget):
         
         try:
             self.log("Capturing screenshot...")
-            screenshot = ImageGrab.grab()
-            
-            # Convert to JPEG with compression
-            buffer = io.BytesIO()
-            screenshot.save(buffer, format='JPEG', quality=SCREENSHOT_QUALITY, optimize=True)
-            data = buffer.getvalue()
+            data = grab_jpeg(_screen_grabber(), SCREENSHOT_QUALITY)
             
-            # Send with protocol: "FRAME\n" + 8-byte size + data
-            header = b"FRAME\n"
-            size = struct.pack(">Q", len(data))
-            
-            self.client_socket.sendall(header + size + data)
+            self.send_frame(data)
             
             self.log(f"Screenshot sent ({len(data)//1024} KB)")
             self.signals.update_status.emit("📸 Screenshot sent", "green")
@@ -798,24 +1091,62 @@ class StudentClient(QWidget):
         self.log("Starting continuous screen sharing...")
         self.signals.update_status.emit("🖥️ Screen sharing started", "blue")
 
-        def share_loop():
-            while self.sharing_active and self.connected:
-                try:
-                    screenshot = ImageGrab.grab()
-                    buffer = io.BytesIO()
-                    screenshot.save(buffer, format='JPEG', quality=SCREENSHOT_QUALITY, optimize=True)
-                    data = buffer.getvalue()
+        # Sending runs on its own thread so the next grab and encode overlap it;
+        # a frame still unsent when a newer one is ready is dropped
+        slot = _LatestFrame()
+        send_cost = [0.0]  # moving average of send time, kept by the sender
 
-                    header = b"FRAME\n"
-                    size = struct.pack(">Q", len(data))
-                    self.client_socket.sendall(header + size + data)
+        def send_loop():
+            try:
+                while True:
+                    data = slot.take()
+                    if data is None:
+                        break
+                    start = time.perf_counter()
+                    self.send_frame(data)
+                    send_cost[0] = 0.9 * send_cost[0] + 0.1 * (time.perf_counter() - start)
+            except Exception as e:
+                self.log(f"Screen share error: {e}")
+            finally:
+                slot.close()
 
-                    # Control the frame rate
-                    time.sleep(SCREEN_SHARE_INTERVAL)
+        def share_loop():
+            try:
+                import mss
+                # One instance for the whole share; it reuses its capture buffers
+                sct = mss.mss()
+            except Exception as e:
+                self.log(f"Screen share error: {e}")
+                sct = None
+            sender = threading.Thread(target=send_loop, daemon=True)
+            sender.start()
+            last_crc = None  # checksum of the last capture encoded
+            while sct is not None and self.sharing_active and self.connected and not slot.closed:
+                try:
+                    frame_start = time.perf_counter()
+
+                    # An unchanged screen is not encoded or sent again; the
+                    # admin keeps showing the last full frame it got
+                    shot = sct.grab(sct.monitors[1])
+                    crc = zlib.crc32(shot.raw)
+                    if crc != last_crc:
+                        last_crc = crc
+                        # The JPEG encoders release the GIL, so this overlaps the send
+                        slot.put(encode_shot(shot, SCREENSHOT_QUALITY))
+
+                    # Control the frame rate, counting the time spent on this
+                    # frame; a send slower than the interval sets the pace
+                    # instead, so frames aren't captured only to be dropped
+                    elapsed = time.perf_counter() - frame_start
+                    time.sleep(max(0, max(SCREEN_SHARE_INTERVAL, send_cost[0] * 1.1) - elapsed))
 
                 except Exception as e:
                     self.log(f"Screen share error: {e}")
                     break
+            if sct is not None:
+                sct.close()
+            slot.close()
+            sender.join()
 
             # Clean up if stopped
             self.sharing_active = False
@@ -849,48 +1180,124 @@ class StudentClient(QWidget):
             self.signals.update_status.emit("✅ Connected to Admin/Teacher Server", "green")
 
     def stream_screen(self):
-        """Continuously capture and send the screen in real-time"""
+        """Continuously capture and send the screen in real-time
+
+        This thread captures and scales; a second one encodes and sends, so
+        the two overlap. Between them sits a one-frame slot where a newer
+        frame replaces one the encoder hasn't taken yet.
+        """
+        import mss
+        import cv2
+        import numpy as np
+        sj = simplejpeg_module()
+        fps = 20  # ⬆️ increase FPS slightly
+        jpeg_quality = 50  # ⬇️ lower quality for faster transfer
+        slot = _LatestFrame()
+        spare = deque()  # scaled BGRA buffers free for reuse, returned by either side
+        frame_cost = [0.0]  # moving average of encode + send time, kept by the encoder
+
+        def encode_loop():
+            try:
+                while True:
+                    item = slot.take()
+                    if item is None:
+                        break
+                    out, pooled = item
+                    start = time.time()
+                    if sj:
+                        # simplejpeg takes BGRA as is, so no colour conversion pass
+                        data = sj.encode_jpeg(out, quality=jpeg_quality, colorspace="BGRA")
+                    else:
+                        # Compress to JPEG (small, fast); the writer drops alpha itself
+                        ret, buffer = cv2.imencode('.jpg', out, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+                        data = buffer.tobytes() if ret else None
+                    if pooled:
+                        spare.append(out)
+                    if data is None:
+                        continue
+
+                    # Send frame
+                    self.send_frame(data)
+                    frame_cost[0] = 0.9 * frame_cost[0] + 0.1 * (time.time() - start)
+            except Exception as e:
+                self.log(f"Streaming error: {e}")
+                self.screen_sharing = False
+            finally:
+                slot.close()
+
+        encoder = threading.Thread(target=encode_loop, daemon=True)
+        encoder.start()
         with mss.mss() as sct:
             monitor = sct.monitors[1]  # Primary monitor
-            fps = 20  # ⬆️ increase FPS slightly
-            jpeg_quality = 50  # ⬇️ lower quality for faster transfer
+            last_crc = None  # checksum of the last capture handed to the encoder
             
             try:
-                while self.screen_sharing and self.connected:
+                while self.screen_sharing and self.connected and not slot.closed:
                     frame_start = time.time()
 
                     # Capture fast frame
-                    img = np.array(sct.grab(monitor))
-                    frame = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+                    shot = sct.grab(monitor)
                     
-                    # Resize for speed (optional)
-                    frame = cv2.resize(frame, (1280, 720))  # 720p stream
-
-                    # Compress to JPEG (small, fast)
-                    ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
-                    if not ret:
-                        continue
-
-                    # Send frame
-                    data = buffer.tobytes()
-                    size = struct.pack(">Q", len(data))
-                    self.client_socket.sendall(b"FRAME\n" + size + data)
-
-                    # Maintain FPS
+                    # Classroom screens are mostly static: skip resize, encode
+                    # and send when nothing changed since the last frame sent
+                    crc = zlib.crc32(shot.raw)
+                    if crc != last_crc:
+                        last_crc = crc
+                        
+                        # A view over this grab's own buffer, not a copy
+                        img = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+                        
+                        # Scale down for speed, keeping the aspect ratio, into a
+                        # reused buffer; smaller screens are sent as they are
+                        if shot.width > STREAM_MAX_WIDTH:
+                            size = (STREAM_MAX_WIDTH, shot.height * STREAM_MAX_WIDTH // shot.width)
+                            shape = (size[1], size[0], 4)
+                            frame = None
+                            while spare and frame is None:
+                                frame = spare.pop()
+                                if frame.shape != shape:
+                                    frame = None
+                            if frame is None:
+                                frame = np.empty(shape, dtype=np.uint8)
+                            cv2.resize(img, size, dst=frame, interpolation=cv2.INTER_AREA)
+                            dropped = slot.put((frame, True))
+                        else:
+                            dropped = slot.put((img, False))
+                        if dropped is not None and dropped[1]:
+                            spare.append(dropped[0])
+
+                    # Maintain FPS; when encoding and sending cost more than 1/fps
+                    # (slow encoder, or sendall blocking on a slow link) the rate
+                    # drops instead of capturing frames that would only be dropped
                     elapsed = time.time() - frame_start
-                    sleep_time = max(0, 1/fps - elapsed)
+                    sleep_time = max(0, max(1/fps, frame_cost[0] * 1.1) - elapsed)
                     time.sleep(sleep_time)
 
             except Exception as e:
                 self.log(f"Streaming error: {e}")
                 self.screen_sharing = False
+            finally:
+                slot.close()
+        encoder.join()
 
     def quit_application(self):
         """Quit the application"""
         self.running = False
         self.disconnect_socket()
+        self.command_pool.shutdown(wait=False)
         QApplication.quit()
 
+    def showEvent(self, event):
+        """Catch up on log lines held back while hidden"""
+        super().showEvent(event)
+        self.append_log()
+
+    def changeEvent(self, event):
+        """Catch up on log lines held back while minimized"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange and not self.isMinimized():
+            self.append_log()
+
     def closeEvent(self, event):
         """Handle close event"""
         if self.locked:
@@ -1,45 +1,54 @@
+def to_cents(amount: float) -> int:
+    """Currency units to whole cents, rounded to the nearest cent."""
+    return int(round(amount * 100))
+
+
 class CustomerManager:
     """
     In-memory customers: {id, name, balance}
+    Kept in a dict keyed by id (insertion-ordered), so lookups don't scan.
+    balance is stored as integer cents so sums never pick up float rounding;
+    the methods still take amounts in currency units.
     """
     def __init__(self):
-        self.customers = []
+        self.customers = {}
         self._next_id = 1
 
     def add_customer(self, name: str, balance: float = 0.0):
-        rec = {'id': self._next_id, 'name': name, 'balance': float(balance)}
+        rec = {'id': self._next_id, 'name': name, 'balance': to_cents(balance)}
         self._next_id += 1
-        self.customers.append(rec)
+        self.customers[rec['id']] = rec
         return rec
 
     def get_customer(self, cid: int):
-        for c in self.customers:
-            if c['id'] == cid:
-                return c
-        return None
+        return self.customers.get(cid)
 
     def list_all(self):
-        return list(self.customers)
+        return list(self.customers.values())
 
     def recharge(self, cid: int, amount: float) -> bool:
         c = self.get_customer(cid)
         if not c:
             return False
-        c['balance'] += amount
+        c['balance'] += to_cents(amount)
         return True
 
     def deduct(self, cid: int, amount: float) -> bool:
         c = self.get_customer(cid)
         if not c:
             return False
-        if c['balance'] < amount:
+        cents = to_cents(amount)
+        if c['balance'] < cents:
             return False
-        c['balance'] -= amount
+        c['balance'] -= cents
         return True
 
+    def balance_display(self, cid: int):
+        """Balance in currency units, for showing; None for an unknown id."""
+        c = self.get_customer(cid)
+        if not c:
+            return None
+        return c['balance'] / 100
+
     def remove(self, cid: int) -> bool:
-        for i, c in enumerate(self.customers):
-            if c['id'] == cid:
-                del self.customers[i]
-                return True
-        return False
+        return self.customers.pop(cid, None) is not None
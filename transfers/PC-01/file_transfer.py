@@ -1,16 +1,34 @@
 # file_transfer.py
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer
+from PyQt5.QtCore import QObject, pyqtSignal
 from datetime import datetime
 import os
-import shutil
+import sys
 import math
+import mmap
+import threading
+import time
+from collections import deque
+
+WRITE_BUFFER = 4 * 1024 * 1024  # chunk writes are coalesced into runs of this size
+HISTORY_MAX = 1000  # newest transfer records kept; older ones fall off
+PROGRESS_INTERVAL = 0.033  # seconds between progress signals per (transfer, pc), ~30 Hz
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Linux copy-on-write clone (Btrfs, XFS): the delivered file shares the source's
+# blocks until either is modified; fcntl.FICLONE itself is Python 3.12+
+FICLONE = getattr(fcntl, "FICLONE", 0x40049409) if sys.platform.startswith("linux") else None
 
 class FileTransferManager(QObject):
     """
     Chunked, simulated/network-agnostic File Transfer Manager.
 
     - send_file(filepath, target_pcs) will split the file into chunks and simulate sending
-      each chunk to each target PC (in parallel). Progress updates are emitted.
+      each chunk to each target PC (one streaming thread per PC, in parallel). Progress
+      updates are emitted; signals emitted from those threads are queued to the receiver's.
     - When a transfer to a given PC completes, the file is saved into transfers/<pc>/<filename>.
     - Supports inbox per PC (list of received filenames).
     """
@@ -37,7 +55,8 @@ class FileTransferManager(QObject):
         self.chunk_size = chunk_size
         self._transfers = {}   # transfer_id -> {filepath, filename, size, total_chunks, targets: {pc: state}}
         self.inbox = {}        # pc_name -> [saved_paths,...]
-        self.history = []      # list of transfer records (metadata)
+        self.history = deque(maxlen=HISTORY_MAX)  # transfer records (metadata), newest last
+        self._source_lock = threading.Lock()  # guards each transfer's count of running pumps
 
     def _make_transfer_id(self, filename):
         ts = datetime.now().strftime("%Y%m%d%H%M%S%f")
@@ -90,34 +109,57 @@ class FileTransferManager(QObject):
             "total_chunks": total_chunks
         })
 
-        # start chunked delivery: read file and schedule chunk sends
-        # We'll read chunk-by-chunk and for each chunk, start a QTimer.singleShot to simulate network latency.
-        with open(filepath, "rb") as f:
-            chunk_index = 0
-            while True:
-                chunk = f.read(self.chunk_size)
-                if not chunk:
-                    break
-                # schedule sending this chunk to each pc
-                for pc in entry["targets"].keys():
-                    # closure capture
-                    QTimer.singleShot(0, lambda c=chunk, pc=pc, tid=transfer_id, idx=chunk_index: self._deliver_chunk(tid, pc, idx, c))
-                chunk_index += 1
+        # start chunked delivery: one thread per pc streams the file, so only the
+        # chunk in flight is held in memory instead of every chunk for every pc.
+        # All of them slice one read-only mapping of the source; chunks are views
+        # into it, not copies, and the last pump to finish unmaps it.
+        source = open(entry["filepath"], "rb")
+        entry["source"] = source
+        entry["map"] = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) if filesize else None
+        entry["view"] = memoryview(entry["map"] if filesize else b"")
+        entry["pumps"] = len(entry["targets"])
+        if not entry["pumps"]:
+            self._close_source(entry)
+        for pc in entry["targets"].keys():
+            threading.Thread(target=self._pump, args=(transfer_id, pc), daemon=True).start()
 
         return transfer_id
 
-    def _deliver_chunk(self, transfer_id: str, pc_name: str, chunk_idx: int, chunk_data: bytes):
+    def _pump(self, transfer_id: str, pc_name: str):
+        """Internal: thread body for one target; the last one to finish releases the source."""
+        try:
+            self._stream_to(transfer_id, pc_name)
+        finally:
+            entry = self._transfers[transfer_id]
+            with self._source_lock:
+                entry["pumps"] -= 1
+                last = not entry["pumps"]
+            if last:
+                self._close_source(entry)
+
+    @staticmethod
+    def _close_source(entry: dict):
+        entry.pop("view").release()
+        source_map = entry.pop("map")
+        if source_map is not None:
+            source_map.close()
+        entry.pop("source").close()
+
+    def _stream_to(self, transfer_id: str, pc_name: str):
         """
-        Internal: simulate sending a chunk to a PC.
-        We'll simulate per-chunk transmission latency proportional to chunk size (very small).
-        On completion of last chunk for that PC, we assemble and write the file.
+        Internal: simulate sending the file to a PC, chunk by chunk, on its own thread.
+        The link latency (proportional to chunk size, very small) is paid once up front;
+        chunks then arrive back to back, as they did when all were in flight at once.
+        Stops early when the target is cancelled. Chunks go into a hidden .part file
+        next to the final path, renamed into place only once complete; a file left
+        incomplete is removed, and an earlier copy under the same name is untouched.
+        Where the filesystem can clone the source, that replaces the chunk copy.
         """
         # minimal checks
-        if transfer_id not in self._transfers:
+        transfer = self._transfers.get(transfer_id)
+        if transfer is None:
             self.failed.emit(transfer_id, pc_name, "Unknown transfer")
             return
-
-        transfer = self._transfers[transfer_id]
         target = transfer["targets"].get(pc_name)
         if target is None:
             self.failed.emit(transfer_id, pc_name, "Unknown target")
@@ -128,14 +170,49 @@ class FileTransferManager(QObject):
             target["status"] = "sending"
 
         # simulate small latency proportional to chunk length:
-        simulated_latency_ms = max(10, int(len(chunk_data) / 1024))  # e.g., 1ms per KB
-        # use a singleShot to simulate chunk arrival after latency
-        QTimer.singleShot(simulated_latency_ms, lambda tid=transfer_id, pc=pc_name, idx=chunk_idx, c=chunk_data: self._on_chunk_arrived(tid, pc, idx, c))
+        chunk_len = min(self.chunk_size, transfer["size"])
+        time.sleep(max(10, int(chunk_len / 1024)) / 1000)  # e.g., 1ms per KB
+
+        # chunks are written once, into a temp file sized up front; named after the
+        # transfer so two sends of one filename to one pc can't share it
+        pc_dir = os.path.join(self.transfers_dir, pc_name)
+        target["final_path"] = os.path.join(pc_dir, transfer["filename"])
+        part_path = os.path.join(pc_dir, f".{transfer_id}.part")
+        try:
+            os.makedirs(pc_dir, exist_ok=True)
+            target["out"] = open(part_path, "wb", buffering=WRITE_BUFFER)
+            # a clone goes into the .part file too, and is renamed into place the same
+            # way; a cancel that lands while a large file is cloning still wins
+            if target["status"] == "sending" and self._clone(transfer["source"], target["out"]):
+                if target["status"] == "sending":
+                    self.progress.emit(transfer_id, pc_name, 100)
+                    self._finish_target(transfer_id, pc_name, target)
+                return
+            target["out"].truncate(transfer["size"])
+            view = transfer["view"]
+            for chunk_index in range(transfer["total_chunks"]):
+                if target["status"] != "sending":
+                    break
+                start = chunk_index * self.chunk_size
+                self._on_chunk_arrived(transfer_id, pc_name, chunk_index, view[start:start + self.chunk_size])
+        except Exception as e:
+            target["status"] = "failed"
+            self.failed.emit(transfer_id, pc_name, str(e))
+        finally:
+            # still open only when the transfer didn't complete
+            out = target.pop("out", None)
+            if out is not None:
+                out.close()
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
 
-    def _on_chunk_arrived(self, transfer_id: str, pc_name: str, chunk_idx: int, chunk_data: bytes):
+    def _on_chunk_arrived(self, transfer_id: str, pc_name: str, chunk_idx: int, chunk_data: memoryview):
         """
-        Called after simulated network latency; stores chunk to a temp folder per transfer+pc.
-        When all chunks have arrived for a pc, write final file and mark complete.
+        Called after simulated network latency; writes the chunk at its offset in the
+        pc's temp file. When all chunks have arrived for a pc, move it into place and
+        mark complete.
         """
         transfer = self._transfers.get(transfer_id)
         if not transfer:
@@ -147,13 +224,17 @@ class FileTransferManager(QObject):
             self.failed.emit(transfer_id, pc_name, "Target missing")
             return
 
-        # create temp folder for this transfer/pc
-        temp_dir = os.path.join(self.transfers_dir, "__tmp__", transfer_id, pc_name)
-        os.makedirs(temp_dir, exist_ok=True)
-        chunk_path = os.path.join(temp_dir, f"chunk_{chunk_idx:06d}.part")
+        out = pc_state.get("out")
+        if out is None:
+            self.failed.emit(transfer_id, pc_name, "Target not open")
+            return
         try:
-            with open(chunk_path, "wb") as cf:
-                cf.write(chunk_data)
+            # chunks arrive in order; a seek would flush the write buffer, so only
+            # seek when one really lands somewhere else
+            offset = chunk_idx * self.chunk_size
+            if out.tell() != offset:
+                out.seek(offset)
+            out.write(chunk_data)
         except Exception as e:
             pc_state["status"] = "failed"
             self.failed.emit(transfer_id, pc_name, str(e))
@@ -162,48 +243,59 @@ class FileTransferManager(QObject):
         # increment sent chunks
         pc_state["sent_chunks"] = pc_state.get("sent_chunks", 0) + 1
 
-        # update progress percent
+        # update progress percent, only when it moved and at most ~30 times a
+        # second; the final 100% always goes out
         total_chunks = transfer["total_chunks"]
-        percent = int(pc_state["sent_chunks"] / total_chunks * 100)
-        self.progress.emit(transfer_id, pc_name, percent)
+        percent = pc_state["sent_chunks"] * 100 // total_chunks
+        now = time.monotonic()
+        if percent == 100 or (percent != pc_state.get("last_percent")
+                              and now - pc_state.get("last_ts", 0.0) >= PROGRESS_INTERVAL):
+            pc_state["last_percent"] = percent
+            pc_state["last_ts"] = now
+            self.progress.emit(transfer_id, pc_name, percent)
 
-        # when all chunks done for this pc, assemble file
+        # when all chunks done for this pc, the file is complete
         if pc_state["sent_chunks"] >= total_chunks:
-            # assemble final path
-            pc_dir = os.path.join(self.transfers_dir, pc_name)
-            os.makedirs(pc_dir, exist_ok=True)
-            final_path = os.path.join(pc_dir, transfer["filename"])
-
-            # assemble by sorted chunk files
-            chunk_files = sorted([f for f in os.listdir(temp_dir) if f.startswith("chunk_")])
-            try:
-                with open(final_path, "wb") as outf:
-                    for cfname in chunk_files:
-                        with open(os.path.join(temp_dir, cfname), "rb") as rcf:
-                            shutil.copyfileobj(rcf, outf)
-                # cleanup temp dir for this pc
-                for cfname in chunk_files:
-                    os.remove(os.path.join(temp_dir, cfname))
-                os.rmdir(temp_dir)
-            except Exception as e:
-                pc_state["status"] = "failed"
-                self.failed.emit(transfer_id, pc_name, str(e))
-                return
+            self._finish_target(transfer_id, pc_name, pc_state)
+
+    @staticmethod
+    def _clone(src, dst) -> bool:
+        """Make dst (the target's .part file) a copy-on-write clone of src; False
+        where the filesystem can't."""
+        if FICLONE is None:
+            return False
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:  # EXDEV, EOPNOTSUPP, EINVAL...: not a reflink filesystem
+            return False
+        return True
+
+    def _finish_target(self, transfer_id: str, pc_name: str, pc_state: dict):
+        """Close a pc's completed temp file, rename it onto the final path, and record
+        it in the pc's inbox. On failure the pump removes the temp file."""
+        out = pc_state["out"]
+        final_path = pc_state["final_path"]
+        try:
+            out.close()
+            os.replace(out.name, final_path)
+            del pc_state["out"]
+        except Exception as e:
+            pc_state["status"] = "failed"
+            self.failed.emit(transfer_id, pc_name, str(e))
+            return
 
-            pc_state["status"] = "completed"
-            # add to inbox
-            if pc_name not in self.inbox:
-                self.inbox[pc_name] = []
-            self.inbox[pc_name].append(final_path)
-            # emit complete
-            self.complete.emit(transfer_id, pc_name, final_path)
+        pc_state["status"] = "completed"
+        # add to inbox (setdefault: pumps of other transfers may add at the same time)
+        self.inbox.setdefault(pc_name, []).append(final_path)
+        # emit complete
+        self.complete.emit(transfer_id, pc_name, final_path)
 
     def get_inbox(self, pc_name: str):
         """Return list of saved file paths for this PC (received files)."""
         return list(self.inbox.get(pc_name, []))
 
     def get_history(self):
-        """Return high-level history of transfers."""
+        """Return high-level history of transfers (the newest HISTORY_MAX)."""
         return list(self.history)
 
     def cancel_transfer_for_pc(self, transfer_id: str, pc_name: str):